@@ -2,22 +2,44 @@ from fastapi import FastAPI
 
 app = FastAPI(title="Demo App", description="Demo application for Woodpecker CI")
 
+# Constant response bodies, built once instead of per request
+ROOT_RESPONSE = {"message": "Hello from Woodpecker CI!"}
+HEALTH_RESPONSE = {"status": "ok"}
+
 
 @app.get("/")
-def root():
+async def root():
     """Root endpoint returning a welcome message."""
-    return {"message": "Hello from Woodpecker CI!"}
+    return ROOT_RESPONSE
 
 
 @app.get("/health")
-def health():
+async def health():
     """Health check endpoint."""
-    return {"status": "ok"}
+    return HEALTH_RESPONSE
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
 
     # Just run uvicorn - the traceback on Ctrl+C is cosmetic only
     # The app shuts down correctly, uvicorn just logs errors during cleanup
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop (libuv event loop) and httptools (C HTTP parser) instead of the
+    # pure-Python asyncio loop and h11. One worker process per CPU this process
+    # may run on (in a container os.cpu_count() reports the host's CPUs)
+    # unless WEB_CONCURRENCY says otherwise; multiple workers need the import
+    # string.
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ.get("WEB_CONCURRENCY", cpus)),
+        loop="uvloop",
+        http="httptools",
+    )
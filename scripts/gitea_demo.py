@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["httpx"]
+# dependencies = ["httpx", "orjson"]
 # ///
 """
 Gitea Demo Repository Script - Create demo repository with Python app and CI pipeline.
 
 Usage:
     uv run scripts/gitea_demo.py                    # Create demo repository
-    uv run scripts/gitea_demo.py --dry-run          # Preview changes
+    uv run scripts/gitea_demo.py --dry-run          # Preview changes (no lookups)
+    uv run scripts/gitea_demo.py --dry-run-verify   # Preview against live state
     uv run scripts/gitea_demo.py --create-issues    # Also create sample issues
     uv run scripts/gitea_demo.py --config path.toml # Custom config file
 """
@@ -16,96 +17,194 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import base64
-import json
+import hashlib
 import os
+import random
 import sys
-import tomllib
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Self
 
-import httpx
+import orjson
+
+# httpx and tomllib are imported where first used, so `--help` and argument
+# errors don't pay for them.
+if TYPE_CHECKING:
+    import httpx
 
 # Default paths
 DEFAULT_CONFIG = Path("config/setup.toml")
 DEMO_REPO_DIR = Path("demo-repo")
 
+# Transient responses worth retrying. POST is not idempotent, so it only
+# retries statuses that mean the request was rejected before processing.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+RETRY_STATUSES_POST = frozenset({429, 503})
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 0.5  # seconds; doubled per attempt, plus jitter
+
+# Request bodies are pre-serialized with orjson rather than httpx's stdlib json
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Files to upload from demo-repo folder (relative paths)
-DEMO_FILES = [
+DEMO_FILES = (
     "main.py",
     "pyproject.toml",
     "Dockerfile",
     ".woodpecker.yaml",
     "README.md",
-]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DemoIssue:
+    """Sample issue to open in the demo repository."""
+
+    title: str
+    body: str = ""
+
+
+def parse_issues(raw: list[dict[str, str]]) -> tuple[DemoIssue, ...]:
+    """Freeze issue dicts (from issues.json or [[demo.issues]]) into DemoIssues."""
+    return tuple(DemoIssue(issue["title"], issue.get("body", "")) for issue in raw)
+
+
+def _read_demo_file(filepath: Path) -> bytes | None:
+    """Read one demo file as raw bytes, or None if it is missing."""
+    try:
+        return filepath.read_bytes()
+    except FileNotFoundError:
+        return None
 
 
-def load_demo_files(demo_dir: Path) -> dict[str, str]:
-    """Load demo repository files from disk."""
+def load_demo_files(demo_dir: Path) -> dict[str, bytes]:
+    """Load demo repository files from disk, overlapping the reads on a thread pool."""
+    with ThreadPoolExecutor(max_workers=min(8, len(DEMO_FILES))) as pool:
+        contents = list(pool.map(_read_demo_file, (demo_dir / name for name in DEMO_FILES)))
+
     files = {}
-    for filename in DEMO_FILES:
-        filepath = demo_dir / filename
-        if filepath.exists():
-            files[filename] = filepath.read_text()
+    for filename, content in zip(DEMO_FILES, contents, strict=True):
+        if content is None:
+            print(f"Warning: Demo file not found: {demo_dir / filename}")
         else:
-            print(f"Warning: Demo file not found: {filepath}")
+            files[filename] = content
     return files
 
 
-def load_issues(demo_dir: Path) -> list[dict[str, str]]:
+def load_issues(demo_dir: Path) -> tuple[DemoIssue, ...]:
     """Load issues from issues.json in demo folder."""
     issues_file = demo_dir / "issues.json"
     if issues_file.exists():
-        return json.loads(issues_file.read_text())
-    return []
+        return parse_issues(orjson.loads(issues_file.read_bytes()))
+    return ()
 
 
 @dataclass
 class GiteaClient:
-    """Simple Gitea API client with basic auth."""
+    """Simple async Gitea API client with basic auth.
+
+    Holds one pooled ``httpx.AsyncClient`` so every call reuses the same
+    keep-alive connections instead of paying a fresh TCP/TLS handshake per
+    request, and independent calls can be awaited concurrently.
+    """
 
     base_url: str
     username: str
     password: str
     dry_run: bool = False
+    client: httpx.AsyncClient = field(init=False, repr=False)
+    # Every contents-API write is a commit on the branch head, so concurrent
+    # writes to one repo race; uploads take this lock around their POST/PUT.
+    write_lock: asyncio.Lock = field(init=False, repr=False, default_factory=asyncio.Lock)
+
+    def __post_init__(self) -> None:
+        import httpx
+
+        self.client = httpx.AsyncClient(
+            base_url=f"{self.base_url.rstrip('/')}/api/v1",
+            headers={"Authorization": self._auth_header()},
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+        )
 
-    def _auth(self) -> httpx.BasicAuth:
-        return httpx.BasicAuth(self.username, self.password)
-
-    def _api(self, path: str) -> str:
-        return f"{self.base_url.rstrip('/')}/api/v1{path}"
-
-    def get(self, path: str) -> httpx.Response:
+    def _auth_header(self) -> str:
+        token = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        return f"Basic {token}"
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying transient failures with exponential backoff.
+
+        Honors ``Retry-After`` when Gitea (or the proxy in front of it) sends one.
+        """
+        retry_on = RETRY_STATUSES_POST if method == "POST" else RETRY_STATUSES
+        for attempt in range(MAX_RETRIES):
+            resp = await self.client.request(method, path, **kwargs)
+            if resp.status_code not in retry_on:
+                return resp
+            delay = RETRY_BASE_DELAY * 2**attempt + random.uniform(0, RETRY_BASE_DELAY)
+            retry_after = resp.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            await asyncio.sleep(delay)
+        return await self.client.request(method, path, **kwargs)
+
+    async def get(self, path: str) -> httpx.Response:
         """GET request to Gitea API."""
-        return httpx.get(self._api(path), auth=self._auth(), timeout=30)
+        return await self._request("GET", path)
 
-    def post(self, path: str, json: dict[str, Any]) -> httpx.Response:
+    async def post(self, path: str, json: dict[str, Any]) -> httpx.Response:
         """POST request to Gitea API."""
         if self.dry_run:
+            import httpx
+
             return httpx.Response(200)
-        return httpx.post(self._api(path), auth=self._auth(), json=json, timeout=30)
+        return await self._request(
+            "POST", path, content=orjson.dumps(json), headers=JSON_HEADERS
+        )
 
-    def put(self, path: str, json: dict[str, Any] | None = None) -> httpx.Response:
+    async def put(self, path: str, json: dict[str, Any] | None = None) -> httpx.Response:
         """PUT request to Gitea API."""
         if self.dry_run:
+            import httpx
+
             return httpx.Response(200)
-        return httpx.put(self._api(path), auth=self._auth(), json=json, timeout=30)
+        if json is None:
+            return await self._request("PUT", path)
+        return await self._request("PUT", path, content=orjson.dumps(json), headers=JSON_HEADERS)
+
+
+def _json(resp: httpx.Response) -> Any:
+    """Decode a JSON response body with orjson."""
+    return orjson.loads(resp.content)
 
 
-def repo_exists(client: GiteaClient, owner: str, repo: str) -> bool:
+async def repo_exists(client: GiteaClient, owner: str, repo: str) -> bool:
     """Check if a repository exists."""
-    resp = client.get(f"/repos/{owner}/{repo}")
+    resp = await client.get(f"/repos/{owner}/{repo}")
     return resp.status_code == 200
 
 
-def create_repository(
+async def create_repository(
     client: GiteaClient,
     owner: str,
     repo_name: str,
     description: str,
     is_org: bool,
     dry_run: bool = False,
+    dry_run_verify: bool = False,
 ) -> bool:
     """Create a repository in Gitea.
 
@@ -115,13 +214,18 @@ def create_repository(
         description: Repository description
         is_org: True if owner is an organization, False for user
         dry_run: Preview mode
+        dry_run_verify: In preview mode, still check whether the repo exists
     """
-    if repo_exists(client, owner, repo_name):
+    target = f"organization '{owner}'" if is_org else f"user '{owner}'"
+    if dry_run and not dry_run_verify:
+        print(f"  [DRY-RUN] Would create repository '{repo_name}' in {target} (if missing)")
+        return True
+
+    if await repo_exists(client, owner, repo_name):
         print(f"  Repository '{owner}/{repo_name}' already exists, skipping creation")
         return True
 
     if dry_run:
-        target = f"organization '{owner}'" if is_org else f"user '{owner}'"
         print(f"  [DRY-RUN] Would create repository '{repo_name}' in {target}")
         return True
 
@@ -138,7 +242,7 @@ def create_repository(
         "private": False,
     }
 
-    resp = client.post(endpoint, payload)
+    resp = await client.post(endpoint, payload)
 
     if resp.status_code in (200, 201):
         print(f"  Created repository '{owner}/{repo_name}'")
@@ -149,97 +253,157 @@ def create_repository(
     else:
         print(f"  Failed to create repository: {resp.status_code}")
         try:
-            print(f"    {resp.json()}")
+            print(f"    {_json(resp)}")
         except Exception:
             pass
         return False
 
 
-def file_exists(client: GiteaClient, owner: str, repo: str, filepath: str) -> dict | None:
+async def file_exists(client: GiteaClient, owner: str, repo: str, filepath: str) -> dict | None:
     """Check if a file exists in the repository. Returns file info with SHA if exists."""
-    resp = client.get(f"/repos/{owner}/{repo}/contents/{filepath}")
+    resp = await client.get(f"/repos/{owner}/{repo}/contents/{filepath}")
     if resp.status_code == 200:
-        return resp.json()
+        return _json(resp)
     return None
 
 
-def create_or_update_file(
+def git_blob_sha(data: bytes) -> str:
+    """Git blob SHA-1 of ``data``, as reported by Gitea for repository files."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+async def list_repo_tree(
+    client: GiteaClient, owner: str, repo: str, ref: str = "main"
+) -> dict[str, str]:
+    """Return ``{path: blob_sha}`` for every file on ``ref`` in one request.
+
+    An empty repository has no branch yet, so a 404 yields an empty dict.
+    """
+    resp = await client.get(f"/repos/{owner}/{repo}/git/trees/{ref}?recursive=true")
+    if resp.status_code != 200:
+        return {}
+    return {
+        entry["path"]: entry["sha"]
+        for entry in _json(resp).get("tree", [])
+        if entry.get("type") == "blob"
+    }
+
+
+async def create_or_update_file(
     client: GiteaClient,
     owner: str,
     repo: str,
     filepath: str,
-    content: str,
+    content: bytes,
     message: str,
     dry_run: bool = False,
+    existing_shas: dict[str, str] | None = None,
 ) -> bool:
-    """Create or update a file in the repository."""
-    existing = file_exists(client, owner, repo, filepath)
-    content_b64 = base64.b64encode(content.encode()).decode()
-
-    if existing:
-        # Check if content is the same
-        existing_content = base64.b64decode(existing.get("content", "")).decode()
-        if existing_content == content:
-            print(f"    {filepath} - unchanged, skipping")
-            return True
+    """Create or update a file in the repository.
 
-        if dry_run:
-            print(f"    [DRY-RUN] Would update {filepath}")
-            return True
+    ``existing_shas`` is the repository tree from ``list_repo_tree``: paths
+    missing from it are created straight away, and present paths are compared
+    by git blob SHA and updated without fetching their content. Without it,
+    creation is attempted first and Gitea's 422 (path already exists)
+    triggers a lookup and update.
+    """
+    path = f"/repos/{owner}/{repo}/contents/{filepath}"
+    local_sha = git_blob_sha(content)
+
+    if existing_shas is not None:
+        existing_sha = existing_shas.get(filepath)
+    elif dry_run:
+        # No tree to preview against: don't spend a lookup per file
+        print(f"    [DRY-RUN] Would create or update {filepath}")
+        return True
+    else:
+        existing_sha = None
+
+    # Gitea reports the git blob SHA, so equal SHAs mean identical content
+    if existing_sha == local_sha:
+        print(f"    {filepath} - unchanged, skipping")
+        return True
+
+    if dry_run:
+        action = "update" if existing_sha else "create"
+        print(f"    [DRY-RUN] Would {action} {filepath}")
+        return True
+
+    content_b64 = base64.b64encode(content).decode("ascii")
+
+    if existing_sha is None:
+        async with client.write_lock:
+            resp = await client.post(path, {"content": content_b64, "message": message})
+        if resp.status_code == 422:
+            existing = await file_exists(client, owner, repo, filepath)
+            if existing:
+                existing_sha = existing["sha"]
+                if existing_sha == local_sha:
+                    print(f"    {filepath} - unchanged, skipping")
+                    return True
 
+    if existing_sha is not None:
         # Update existing file
         payload = {
             "content": content_b64,
             "message": f"Update {filepath}",
-            "sha": existing["sha"],
+            "sha": existing_sha,
         }
-        resp = client.put(f"/repos/{owner}/{repo}/contents/{filepath}", payload)
-    else:
-        if dry_run:
-            print(f"    [DRY-RUN] Would create {filepath}")
-            return True
-
-        # Create new file
-        payload = {
-            "content": content_b64,
-            "message": message,
-        }
-        resp = client.post(f"/repos/{owner}/{repo}/contents/{filepath}", payload)
+        async with client.write_lock:
+            resp = await client.put(path, payload)
 
     if resp.status_code in (200, 201):
-        action = "Updated" if existing else "Created"
+        action = "Updated" if existing_sha else "Created"
         print(f"    {filepath} - {action.lower()}")
         return True
     else:
         print(f"    Failed to create {filepath}: {resp.status_code}")
         try:
-            print(f"      {resp.json()}")
+            print(f"      {_json(resp)}")
         except Exception:
             pass
         return False
 
 
-def issue_exists(client: GiteaClient, owner: str, repo: str, title: str) -> bool:
-    """Check if an issue with the given title exists."""
-    resp = client.get(f"/repos/{owner}/{repo}/issues?state=all")
-    if resp.status_code != 200:
-        return False
-    issues = resp.json()
-    return any(issue.get("title") == title for issue in issues)
+async def list_issue_titles(
+    client: GiteaClient, owner: str, repo: str, limit: int = 50
+) -> set[str]:
+    """Collect the titles of all issues (open and closed), one request per page."""
+    titles: set[str] = set()
+    page = 1
+    while True:
+        resp = await client.get(
+            f"/repos/{owner}/{repo}/issues?state=all&type=issues&page={page}&limit={limit}"
+        )
+        if resp.status_code != 200:
+            break
+        batch = _json(resp)
+        titles.update(issue["title"] for issue in batch)
+        if len(batch) < limit:
+            break
+        page += 1
+    return titles
 
 
-def create_issue(
+async def create_issue(
     client: GiteaClient,
     owner: str,
     repo: str,
     title: str,
     body: str,
     dry_run: bool = False,
+    existing_titles: set[str] | None = None,
 ) -> bool:
-    """Create an issue in the repository."""
-    if issue_exists(client, owner, repo, title):
-        print(f"    Issue '{title}' already exists, skipping")
-        return True
+    """Create an issue in the repository.
+
+    ``existing_titles`` (from ``list_issue_titles``) makes creation idempotent;
+    the title is claimed before the POST so duplicates within one run skip too.
+    """
+    if existing_titles is not None:
+        if title in existing_titles:
+            print(f"    Issue '{title}' already exists, skipping")
+            return True
+        existing_titles.add(title)
 
     if dry_run:
         print(f"    [DRY-RUN] Would create issue '{title}'")
@@ -249,34 +413,36 @@ def create_issue(
         "title": title,
         "body": body,
     }
-    resp = client.post(f"/repos/{owner}/{repo}/issues", payload)
+    resp = await client.post(f"/repos/{owner}/{repo}/issues", payload)
 
     if resp.status_code in (200, 201):
         print(f"    Created issue '{title}'")
         return True
     else:
         print(f"    Failed to create issue '{title}': {resp.status_code}")
+        if existing_titles is not None:
+            existing_titles.discard(title)
         return False
 
 
-def org_exists(client: GiteaClient, org_name: str) -> bool:
+async def org_exists(client: GiteaClient, org_name: str) -> bool:
     """Check if an organization exists."""
-    resp = client.get(f"/orgs/{org_name}")
+    resp = await client.get(f"/orgs/{org_name}")
     return resp.status_code == 200
 
 
 def load_config(config_path: Path) -> dict[str, Any]:
     """Load TOML configuration."""
-    if not config_path.exists():
+    import tomllib
+
+    try:
+        with open(config_path, "rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
         print(f"Error: Configuration file not found: {config_path}")
         print("Run 'just wizard' to create one, or use --config to specify a path.")
         sys.exit(1)
 
-    with open(config_path, "rb") as f:
-        config = tomllib.load(f)
-
-    return config
-
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -301,12 +467,19 @@ def main() -> None:
         action="store_true",
         help="Preview changes without making API calls",
     )
+    parser.add_argument(
+        "--dry-run-verify",
+        action="store_true",
+        help="Like --dry-run, but look up existing repo/files/issues (read-only)",
+    )
     parser.add_argument(
         "--create-issues",
         action="store_true",
         help="Create sample issues in the demo repository",
     )
     args = parser.parse_args()
+    if args.dry_run_verify:
+        args.dry_run = True
 
     # Check demo folder exists
     if not args.demo_dir.exists():
@@ -338,95 +511,132 @@ def main() -> None:
     gitea_url = config.get("gitea", {}).get("url", "http://gitea.localhost")
     admin_username = config.get("admin", {}).get("username", "admin")
 
+    asyncio.run(
+        run(args, config, demo_files, gitea_url, admin_username, admin_password)
+    )
+
+
+async def run(
+    args: argparse.Namespace,
+    config: dict[str, Any],
+    demo_files: dict[str, bytes],
+    gitea_url: str,
+    admin_username: str,
+    admin_password: str,
+) -> None:
+    """Create the demo repository, upload files and issues against Gitea."""
+    import httpx
+
+    demo_config = config.get("demo", {})
+
     # Create API client
-    client = GiteaClient(
+    async with GiteaClient(
         base_url=gitea_url,
         username=admin_username,
         password=admin_password,
         dry_run=args.dry_run,
-    )
+    ) as client:
+        if args.dry_run:
+            print("=== DRY RUN MODE - No changes will be made ===\n")
 
-    if args.dry_run:
-        print("=== DRY RUN MODE - No changes will be made ===\n")
-
-    # Test connection
-    print("Connecting to Gitea...")
-    try:
-        resp = client.get("/version")
-        if resp.status_code != 200:
-            print(f"Error: Could not connect to Gitea at {gitea_url}")
+        # Test connection
+        print("Connecting to Gitea...")
+        try:
+            resp = await client.get("/version")
+            if resp.status_code != 200:
+                print(f"Error: Could not connect to Gitea at {gitea_url}")
+                sys.exit(1)
+            version = _json(resp).get("version", "unknown")
+            print(f"  Connected to Gitea v{version}\n")
+        except httpx.RequestError as e:
+            print(f"Error: Could not connect to Gitea: {e}")
             sys.exit(1)
-        version = resp.json().get("version", "unknown")
-        print(f"  Connected to Gitea v{version}\n")
-    except httpx.RequestError as e:
-        print(f"Error: Could not connect to Gitea: {e}")
-        sys.exit(1)
 
-    # Determine repository owner (org or user)
-    org_config = config.get("organization")
-    repo_name = demo_config.get("repo_name", "demo-app")
-    repo_description = demo_config.get(
-        "repo_description", "Demo Python application for CI testing"
-    )
+        # Determine repository owner (org or user)
+        org_config = config.get("organization")
+        repo_name = demo_config.get("repo_name", "demo-app")
+        repo_description = demo_config.get(
+            "repo_description", "Demo Python application for CI testing"
+        )
 
-    if org_config and org_exists(client, org_config["name"]):
-        owner = org_config["name"]
-        is_org = True
-        print(f"Using organization: {owner}")
-    else:
-        owner = admin_username
-        is_org = False
-        print(f"No organization configured, using user: {owner}")
-
-    # Create repository
-    print(f"\nCreating repository '{repo_name}'...")
-    if not create_repository(
-        client, owner, repo_name, repo_description, is_org, dry_run=args.dry_run
-    ):
-        print("Failed to create repository, aborting")
-        sys.exit(1)
+        # A plain dry-run makes no calls beyond /version: assume the org exists
+        lookups = not args.dry_run or args.dry_run_verify
+        if org_config and (not lookups or await org_exists(client, org_config["name"])):
+            owner = org_config["name"]
+            is_org = True
+            print(f"Using organization: {owner}")
+        else:
+            owner = admin_username
+            is_org = False
+            print(f"No organization configured, using user: {owner}")
 
-    # Upload demo files
-    print("\nUploading demo files...")
-    for filepath, content in demo_files.items():
-        create_or_update_file(
+        # Create repository
+        print(f"\nCreating repository '{repo_name}'...")
+        if not await create_repository(
             client,
             owner,
             repo_name,
-            filepath,
-            content,
-            "Initial commit: Add demo application",
+            repo_description,
+            is_org,
             dry_run=args.dry_run,
-        )
+            dry_run_verify=args.dry_run_verify,
+        ):
+            print("Failed to create repository, aborting")
+            sys.exit(1)
 
-    # Create issues if requested
-    if args.create_issues or demo_config.get("create_issues", False):
-        print("\nCreating sample issues...")
-
-        # Load issues from file or use config
-        issues = load_issues(args.demo_dir)
-        if not issues:
-            issues = demo_config.get("issues", [])
-
-        for issue in issues:
-            create_issue(
-                client,
-                owner,
-                repo_name,
-                issue["title"],
-                issue.get("body", ""),
-                dry_run=args.dry_run,
+        # Upload demo files (existence checks overlap; writes serialize on the lock)
+        print("\nUploading demo files...")
+        existing_shas = await list_repo_tree(client, owner, repo_name) if lookups else None
+        await asyncio.gather(
+            *(
+                create_or_update_file(
+                    client,
+                    owner,
+                    repo_name,
+                    filepath,
+                    content,
+                    "Initial commit: Add demo application",
+                    dry_run=args.dry_run,
+                    existing_shas=existing_shas,
+                )
+                for filepath, content in demo_files.items()
             )
+        )
 
-    print("\nDone!")
-    print(f"\nRepository URL: {gitea_url}/{owner}/{repo_name}")
-    print("\nNext steps:")
-    print("  1. Go to Woodpecker CI (http://ci.localhost)")
-    print("  2. Click 'Add repository' and activate the demo-app")
-    print("  3. Push a commit or trigger a build to see the pipeline run")
+        # Create issues if requested
+        if args.create_issues or demo_config.get("create_issues", False):
+            print("\nCreating sample issues...")
 
-    if args.dry_run:
-        print("\n=== DRY RUN COMPLETE - Run without --dry-run to apply changes ===")
+            # Load issues from file or use config
+            issues = load_issues(args.demo_dir)
+            if not issues:
+                issues = parse_issues(demo_config.get("issues", []))
+
+            existing_titles = (
+                await list_issue_titles(client, owner, repo_name) if lookups else None
+            )
+            # One at a time: Gitea numbers issues in creation order, so
+            # concurrent POSTs would shuffle #1, #2, ... from run to run
+            for issue in issues:
+                await create_issue(
+                    client,
+                    owner,
+                    repo_name,
+                    issue.title,
+                    issue.body,
+                    dry_run=args.dry_run,
+                    existing_titles=existing_titles,
+                )
+
+        print("\nDone!")
+        print(f"\nRepository URL: {gitea_url}/{owner}/{repo_name}")
+        print("\nNext steps:")
+        print("  1. Go to Woodpecker CI (http://ci.localhost)")
+        print("  2. Click 'Add repository' and activate the demo-app")
+        print("  3. Push a commit or trigger a build to see the pipeline run")
+
+        if args.dry_run:
+            print("\n=== DRY RUN COMPLETE - Run without --dry-run to apply changes ===")
 
 
 if __name__ == "__main__":
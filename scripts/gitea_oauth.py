@@ -16,8 +16,11 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
+import re
+import shutil
 import subprocess
 import sys
 import tomllib
@@ -47,8 +50,9 @@ def get_woodpecker_env(var_name: str) -> str | None:
         )
         if result.returncode == 0:
             for line in result.stdout.splitlines():
-                if line.startswith(f"{var_name}="):
-                    return line.split("=", 1)[1]
+                key, sep, value = line.partition("=")
+                if sep and key == var_name:
+                    return value
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     return None
@@ -75,81 +79,72 @@ def restart_woodpecker() -> bool:
 
 
 def update_env_file(client_id: str, client_secret: str, prefix: str = "WOODPECKER_GITEA") -> bool:
-    """Update or append OAuth credentials in .env file."""
-    if not ENV_FILE.exists():
-        return False
-
-    content = ENV_FILE.read_text()
-    lines = content.splitlines()
-    new_lines = []
-    client_key = f"{prefix}_CLIENT"
-    secret_key = f"{prefix}_SECRET"
-    client_found = False
-    secret_found = False
-
-    for line in lines:
-        if line.startswith(f"{client_key}="):
-            new_lines.append(f"{client_key}={client_id}")
-            client_found = True
-        elif line.startswith(f"{secret_key}="):
-            new_lines.append(f"{secret_key}={client_secret}")
-            secret_found = True
-        else:
-            new_lines.append(line)
+    """Update or append OAuth credentials in .env file.
 
-    if not client_found:
-        new_lines.append(f"{client_key}={client_id}")
-    if not secret_found:
-        new_lines.append(f"{secret_key}={client_secret}")
+    One read, one regex substitution per key, and one atomic write (temp file
+    + rename, keeping the original file mode) so a crash can't leave a torn .env.
+    """
+    try:
+        content = ENV_FILE.read_text()
+    except FileNotFoundError:
+        return False
 
-    ENV_FILE.write_text("\n".join(new_lines) + "\n")
+    for key, value in ((f"{prefix}_CLIENT", client_id), (f"{prefix}_SECRET", client_secret)):
+        line = f"{key}={value}"
+        content, count = re.subn(
+            rf"^{re.escape(key)}=.*$", lambda _, line=line: line, content, flags=re.MULTILINE
+        )
+        if not count:
+            if content and not content.endswith("\n"):
+                content += "\n"
+            content += f"{line}\n"
+
+    if not content.endswith("\n"):
+        content += "\n"
+    # The temp copy holds secrets: create it owner-only, then take .env's mode
+    tmp = ENV_FILE.with_name(f"{ENV_FILE.name}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+    shutil.copymode(ENV_FILE, tmp)
+    os.replace(tmp, ENV_FILE)
     return True
 
 
-def get_oauth_apps(
-    base_url: str, username: str, password: str
-) -> list[dict[str, Any]]:
-    """Get list of existing OAuth2 applications."""
-    auth = httpx.BasicAuth(username, password)
-    resp = httpx.get(
-        f"{base_url}/api/v1/user/applications/oauth2",
-        auth=auth,
+def make_client(url: str, username: str, password: str) -> httpx.Client:
+    """Create a pooled client for the Gitea API (``/api/v1`` baked into base_url)."""
+    return httpx.Client(
+        base_url=f"{url.rstrip('/')}/api/v1",
+        auth=httpx.BasicAuth(username, password),
         timeout=30,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=10),
     )
+
+
+def get_oauth_apps(client: httpx.Client) -> list[dict[str, Any]]:
+    """Get list of existing OAuth2 applications."""
+    resp = client.get("/user/applications/oauth2")
     if resp.status_code == 200:
         return resp.json()
     return []
 
 
-def find_app_by_name(
-    apps: list[dict[str, Any]], name: str
-) -> dict[str, Any] | None:
-    """Find OAuth app by name."""
-    for app in apps:
-        if app.get("name") == name:
-            return app
-    return None
-
-
 def create_oauth_app(
-    base_url: str,
-    username: str,
-    password: str,
+    client: httpx.Client,
     name: str,
     redirect_uri: str,
     confidential: bool = True,
 ) -> dict[str, Any] | None:
     """Create OAuth2 application. Returns app data with client_id and client_secret."""
-    auth = httpx.BasicAuth(username, password)
-    resp = httpx.post(
-        f"{base_url}/api/v1/user/applications/oauth2",
-        auth=auth,
+    resp = client.post(
+        "/user/applications/oauth2",
         json={
             "name": name,
             "redirect_uris": [redirect_uri],
             "confidential_client": confidential,
         },
-        timeout=30,
     )
 
     if resp.status_code in (200, 201):
@@ -189,15 +184,26 @@ def format_output(
         )
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_toml_cached(path: Path, size: int, mtime_ns: int) -> dict[str, Any]:
+    """Load a TOML file; size and mtime are only part of the cache key."""
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def _parse_toml(path: Path) -> dict[str, Any]:
+    """Parse a TOML file once per (resolved path, size, mtime); later calls reuse the dict."""
+    resolved = path.resolve()
+    stat = resolved.stat()
+    return _parse_toml_cached(resolved, stat.st_size, stat.st_mtime_ns)
+
+
 def load_oauth_config(config_path: Path) -> list[dict[str, Any]]:
     """Load OAuth app config from TOML file."""
     if not config_path.exists():
         return []
 
-    with open(config_path, "rb") as f:
-        config = tomllib.load(f)
-
-    return config.get("oauth_apps", [])
+    return _parse_toml(config_path).get("oauth_apps", [])
 
 
 def main() -> None:
@@ -257,78 +263,77 @@ def main() -> None:
     # Load URL from config if available
     gitea_url = args.url
     if args.config and args.config.exists():
-        with open(args.config, "rb") as f:
-            config = tomllib.load(f)
+        config = _parse_toml(args.config)
         gitea_url = config.get("gitea", {}).get("url", gitea_url)
         admin_user = config.get("admin", {}).get("username", admin_user)
 
-    # Check for existing apps
-    existing_apps = get_oauth_apps(gitea_url, admin_user, admin_pass)
-
-    # Process apps from config or command line
-    apps_to_create: list[dict[str, Any]] = []
-
-    if args.config:
-        oauth_configs = load_oauth_config(args.config)
-        for oauth_config in oauth_configs:
+    # One pooled connection for every API call in this run
+    with make_client(gitea_url, admin_user, admin_pass) as client:
+        # Check for existing apps (indexed by name for the lookups below)
+        existing_apps = {app.get("name"): app for app in get_oauth_apps(client)}
+
+        # Process apps from config or command line
+        apps_to_create: list[dict[str, Any]] = []
+
+        if args.config:
+            oauth_configs = load_oauth_config(args.config)
+            for oauth_config in oauth_configs:
+                apps_to_create.append({
+                    "name": oauth_config.get("name", DEFAULT_NAME),
+                    "redirect_uri": oauth_config.get("redirect_uri", DEFAULT_REDIRECT),
+                    "confidential": oauth_config.get("confidential", True),
+                })
+        else:
             apps_to_create.append({
-                "name": oauth_config.get("name", DEFAULT_NAME),
-                "redirect_uri": oauth_config.get("redirect_uri", DEFAULT_REDIRECT),
-                "confidential": oauth_config.get("confidential", True),
+                "name": args.name,
+                "redirect_uri": args.redirect,
+                "confidential": not args.public,
             })
-    else:
-        apps_to_create.append({
-            "name": args.name,
-            "redirect_uri": args.redirect,
-            "confidential": not args.public,
-        })
-
-    # Create each app
-    for app_config in apps_to_create:
-        name = app_config["name"]
-        redirect_uri = app_config["redirect_uri"]
-        confidential = app_config["confidential"]
-
-        # Check if app already exists
-        existing = find_app_by_name(existing_apps, name)
-        if existing:
-            if args.format == "human":
-                print(f"OAuth app '{name}' already exists (id={existing.get('id')})")
-                print("Note: Cannot retrieve existing secret. Delete and recreate if needed.")
-                print(f"  Client ID: {existing.get('client_id', 'N/A')}")
-            else:
-                # For non-human formats, output existing client_id (no secret available)
-                print(format_output({"client_id": existing.get("client_id"), "client_secret": "[EXISTING - NOT AVAILABLE]", "name": name}, args.format))
-            continue
-
-        # Create new app
-        app_data = create_oauth_app(
-            gitea_url, admin_user, admin_pass, name, redirect_uri, confidential
-        )
 
-        if app_data:
-            print(format_output(app_data, args.format))
-
-            # Write to .env unless --no-env or non-human format
-            if args.format == "human" and not args.no_env:
-                client_id = app_data.get("client_id", "")
-                client_secret = app_data.get("client_secret", "")
-                if update_env_file(client_id, client_secret):
-                    print("✓ Updated .env with OAuth credentials")
-
-                    # Check if Woodpecker needs restart
-                    current_client = get_woodpecker_env("WOODPECKER_GITEA_CLIENT")
-                    if current_client and current_client != client_id:
-                        print("  Woodpecker has stale OAuth credentials, restarting...")
-                        if restart_woodpecker():
-                            print("✓ Woodpecker restarted with new credentials")
-                        else:
-                            print("⚠ Failed to restart Woodpecker, run: just docker-restart")
-                    elif current_client == client_id:
-                        pass  # Already up to date
-                    # If current_client is None, Woodpecker might not be running
+        # Create each app
+        for app_config in apps_to_create:
+            name = app_config["name"]
+            redirect_uri = app_config["redirect_uri"]
+            confidential = app_config["confidential"]
+
+            # Check if app already exists
+            existing = existing_apps.get(name)
+            if existing:
+                if args.format == "human":
+                    print(f"OAuth app '{name}' already exists (id={existing.get('id')})")
+                    print("Note: Cannot retrieve existing secret. Delete and recreate if needed.")
+                    print(f"  Client ID: {existing.get('client_id', 'N/A')}")
                 else:
-                    print("⚠ Could not update .env (file not found)")
+                    # For non-human formats, output existing client_id (no secret available)
+                    print(format_output({"client_id": existing.get("client_id"), "client_secret": "[EXISTING - NOT AVAILABLE]", "name": name}, args.format))
+                continue
+
+            # Create new app
+            app_data = create_oauth_app(client, name, redirect_uri, confidential)
+
+            if app_data:
+                print(format_output(app_data, args.format))
+
+                # Write to .env unless --no-env or non-human format
+                if args.format == "human" and not args.no_env:
+                    client_id = app_data.get("client_id", "")
+                    client_secret = app_data.get("client_secret", "")
+                    if update_env_file(client_id, client_secret):
+                        print("✓ Updated .env with OAuth credentials")
+
+                        # Check if Woodpecker needs restart
+                        current_client = get_woodpecker_env("WOODPECKER_GITEA_CLIENT")
+                        if current_client and current_client != client_id:
+                            print("  Woodpecker has stale OAuth credentials, restarting...")
+                            if restart_woodpecker():
+                                print("✓ Woodpecker restarted with new credentials")
+                            else:
+                                print("⚠ Failed to restart Woodpecker, run: just docker-restart")
+                        elif current_client == client_id:
+                            pass  # Already up to date
+                        # If current_client is None, Woodpecker might not be running
+                    else:
+                        print("⚠ Could not update .env (file not found)")
 
     # Show next steps for human format
     if args.format == "human":
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["httpx"]
+# dependencies = ["httpx[http2]"]
 # ///
 """
 Gitea Setup Script - Provision users, organizations, and teams from TOML config.
@@ -15,14 +15,17 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
+import io
 import os
 import secrets
-import string
 import sys
 import tomllib
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Self, TypeVar
 
 import httpx
 
@@ -30,60 +33,133 @@ import httpx
 DEFAULT_CONFIG = Path("config/setup.toml")
 EXAMPLE_CONFIG = Path("config/setup.toml.example")
 
+# Team permission (config value -> Gitea value) and the units every team gets
+TEAM_PERMISSIONS = {"read": "read", "write": "write", "admin": "admin"}
+TEAM_UNITS = ("repo.code", "repo.issues", "repo.pulls", "repo.releases", "repo.wiki")
+
+T = TypeVar("T")
+
 
 @dataclass
 class GiteaClient:
-    """Simple Gitea API client with basic auth."""
+    """Simple async Gitea API client with basic auth.
+
+    Holds one pooled ``httpx.AsyncClient`` so every call reuses the same
+    keep-alive connections instead of paying a fresh TCP/TLS handshake per
+    request, and independent calls can be awaited concurrently.
+    """
 
     base_url: str
     username: str
     password: str
     dry_run: bool = False
+    client: httpx.AsyncClient = field(init=False, repr=False)
+    # Existence lookups are stable within a run: each one is issued at most
+    # once (concurrent callers await the same task) and this run's creates are
+    # recorded as completed futures
+    _user_cache: dict[str, asyncio.Future[bool]] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    _org_cache: dict[str, asyncio.Future[bool]] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    _team_cache: dict[str, asyncio.Future[dict[str, int] | None]] = field(
+        init=False, repr=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        self.client = httpx.AsyncClient(
+            base_url=f"{self.base_url.rstrip('/')}/api/v1",
+            auth=httpx.BasicAuth(self.username, self.password),
+            timeout=30,
+            # HTTP/2 (negotiated over TLS) multiplexes the concurrent calls on
+            # one connection. The limits go on the transport: httpx ignores a
+            # client-level limits= once a transport is passed explicitly
+            transport=httpx.AsyncHTTPTransport(
+                retries=1,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+            ),
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
 
-    def _auth(self) -> httpx.BasicAuth:
-        return httpx.BasicAuth(self.username, self.password)
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
 
-    def _api(self, path: str) -> str:
-        return f"{self.base_url.rstrip('/')}/api/v1{path}"
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.client.aclose()
 
-    def get(self, path: str) -> httpx.Response:
+    def set_credentials(self, username: str, password: str) -> None:
+        """Switch the credentials used for subsequent requests (e.g. after a rename)."""
+        self.username = username
+        self.password = password
+        self.client.auth = httpx.BasicAuth(username, password)
+
+    async def get(self, path: str) -> httpx.Response:
         """GET request to Gitea API."""
-        return httpx.get(self._api(path), auth=self._auth(), timeout=30)
+        return await self.client.get(path)
 
-    def post(self, path: str, json: dict[str, Any]) -> httpx.Response:
+    async def post(self, path: str, json: dict[str, Any]) -> httpx.Response:
         """POST request to Gitea API."""
         if self.dry_run:
             return httpx.Response(200)
-        return httpx.post(self._api(path), auth=self._auth(), json=json, timeout=30)
+        return await self.client.post(path, json=json)
 
-    def put(self, path: str) -> httpx.Response:
+    async def put(self, path: str) -> httpx.Response:
         """PUT request to Gitea API."""
         if self.dry_run:
             return httpx.Response(200)
-        return httpx.put(self._api(path), auth=self._auth(), timeout=30)
+        return await self.client.put(path)
 
-    def patch(self, path: str, json: dict[str, Any]) -> httpx.Response:
+    async def patch(self, path: str, json: dict[str, Any]) -> httpx.Response:
         """PATCH request to Gitea API."""
         if self.dry_run:
             return httpx.Response(200)
-        return httpx.patch(self._api(path), auth=self._auth(), json=json, timeout=30)
+        return await self.client.patch(path, json=json)
+
+
+def _memo(
+    cache: dict[str, asyncio.Future[T]],
+    key: str,
+    lookup: Callable[[], Coroutine[Any, Any, T]],
+) -> asyncio.Future[T]:
+    """Return the shared lookup task for ``key``, starting it on first use."""
+    if key not in cache:
+        cache[key] = asyncio.ensure_future(lookup())
+    return cache[key]
+
+
+def _known(value: T) -> asyncio.Future[T]:
+    """Return an already-resolved future, for recording what this run created."""
+    future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+async def _gather(aws: list[Awaitable[T]], sequential: bool = False) -> list[T]:
+    """Await ``aws`` concurrently, or one at a time in order when ``sequential``."""
+    if sequential:
+        return [await aw for aw in aws]
+    return list(await asyncio.gather(*aws))
 
 
 def generate_password(length: int = 16) -> str:
-    """Generate a random password."""
-    alphabet = string.ascii_letters + string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    """Generate a random URL-safe password (one CSPRNG read)."""
+    return secrets.token_urlsafe(length)[:length]
 
 
-def get_user_info(client: GiteaClient, username: str) -> dict[str, Any] | None:
+async def get_user_info(client: GiteaClient, username: str) -> dict[str, Any] | None:
     """Get user info from Gitea API."""
-    resp = client.get(f"/users/{username}")
+    resp = await client.get(f"/users/{username}")
     if resp.status_code == 200:
         return resp.json()
     return None
 
 
-def update_admin(
+async def update_admin(
     client: GiteaClient,
     current_username: str,
     update_config: dict[str, Any],
@@ -105,17 +181,17 @@ def update_admin(
     should_rename = False
     if new_username and new_username != current_username:
         # Check if new_username already exists (already renamed)
-        if get_user_info(client, new_username):
+        if await get_user_info(client, new_username):
             print(f"  Admin already renamed to '{new_username}', skipping rename")
             actual_username = new_username
-        elif not get_user_info(client, current_username):
+        elif not await get_user_info(client, current_username):
             print(f"  Error: Admin user '{current_username}' not found")
             return False, current_username
         else:
             should_rename = True
 
     # Get current user info to check email
-    user_info = get_user_info(client, actual_username)
+    user_info = await get_user_info(client, actual_username)
     if not user_info:
         print(f"  Error: Could not get info for user '{actual_username}'")
         return False, actual_username
@@ -126,12 +202,14 @@ def update_admin(
             print(f"  [DRY-RUN] Would rename '{actual_username}' to '{new_username}'")
             actual_username = new_username  # For dry-run, pretend it worked
         else:
-            resp = client.post(f"/admin/users/{actual_username}/rename", {"new_username": new_username})
+            resp = await client.post(f"/admin/users/{actual_username}/rename", {"new_username": new_username})
             if resp.status_code in (200, 204):
                 print(f"  Renamed '{actual_username}' to '{new_username}'")
+                client._user_cache[actual_username] = _known(False)
+                client._user_cache[new_username] = _known(True)
                 actual_username = new_username
                 # Update client to use new username for subsequent API calls
-                client.username = new_username
+                client.set_credentials(new_username, client.password)
             else:
                 print(f"  Failed to rename user: {resp.status_code}")
                 try:
@@ -176,7 +254,7 @@ def update_admin(
         print(f"  [DRY-RUN] Would update admin: {', '.join(changes)}")
         return True, actual_username
 
-    resp = client.patch(f"/admin/users/{actual_username}", payload)
+    resp = await client.patch(f"/admin/users/{actual_username}", payload)
 
     if resp.status_code in (200, 204):
         if payload.get("email"):
@@ -193,23 +271,44 @@ def update_admin(
         return False, actual_username
 
 
-def user_exists(client: GiteaClient, username: str) -> bool:
-    """Check if a user exists."""
-    resp = client.get(f"/users/{username}")
-    return resp.status_code == 200
+async def user_exists(client: GiteaClient, username: str) -> bool:
+    """Check if a user exists (looked up once per run)."""
+
+    async def lookup() -> bool:
+        resp = await client.get(f"/users/{username}")
+        return resp.status_code == 200
+
+    return await _memo(client._user_cache, username, lookup)
+
+
+def env_passwords(usernames: list[str]) -> dict[str, str]:
+    """Map usernames to their ``<USERNAME>_PASSWORD`` env vars in one environment scan."""
+    wanted = {username.upper(): username for username in usernames}
+    suffix = "_PASSWORD"
+    return {
+        wanted[key[: -len(suffix)]]: value
+        for key, value in os.environ.items()
+        if key.endswith(suffix) and key[: -len(suffix)] in wanted
+    }
 
 
-def create_user(
-    client: GiteaClient, username: str, email: str, dry_run: bool = False
+async def create_user(
+    client: GiteaClient,
+    username: str,
+    email: str,
+    dry_run: bool = False,
+    preset_password: str | None = None,
 ) -> str | None:
-    """Create a Gitea user. Returns password if created, None if exists."""
-    if user_exists(client, username):
+    """Create a Gitea user. Returns password if created, None if exists.
+
+    ``preset_password`` is the user's ``<USERNAME>_PASSWORD`` env var (see
+    ``env_passwords``); a random password is generated when it is unset.
+    """
+    if await user_exists(client, username):
         print(f"  User '{username}' already exists, skipping")
         return None
 
-    # Get password from env or generate
-    env_key = f"{username.upper()}_PASSWORD"
-    password = os.environ.get(env_key)
+    password = preset_password
     generated = False
     if not password:
         password = generate_password()
@@ -219,7 +318,7 @@ def create_user(
         print(f"  [DRY-RUN] Would create user '{username}' ({email})")
         return password if generated else None
 
-    resp = client.post(
+    resp = await client.post(
         "/admin/users",
         {
             "username": username,
@@ -231,9 +330,10 @@ def create_user(
 
     if resp.status_code in (200, 201):
         print(f"  Created user '{username}'")
+        client._user_cache[username] = _known(True)
         if generated:
             print(f"    Generated password: {password}")
-            print(f"    (Set {env_key} to use a custom password)")
+            print(f"    (Set {username.upper()}_PASSWORD to use a custom password)")
         return password if generated else None
     else:
         print(f"  Failed to create user '{username}': {resp.status_code}")
@@ -244,13 +344,17 @@ def create_user(
         return None
 
 
-def org_exists(client: GiteaClient, org_name: str) -> bool:
-    """Check if an organization exists."""
-    resp = client.get(f"/orgs/{org_name}")
-    return resp.status_code == 200
+async def org_exists(client: GiteaClient, org_name: str) -> bool:
+    """Check if an organization exists (looked up once per run)."""
+
+    async def lookup() -> bool:
+        resp = await client.get(f"/orgs/{org_name}")
+        return resp.status_code == 200
+
+    return await _memo(client._org_cache, org_name, lookup)
 
 
-def create_organization(
+async def create_organization(
     client: GiteaClient,
     name: str,
     description: str,
@@ -258,7 +362,7 @@ def create_organization(
     dry_run: bool = False,
 ) -> bool:
     """Create a Gitea organization."""
-    if org_exists(client, name):
+    if await org_exists(client, name):
         print(f"  Organization '{name}' already exists, skipping")
         return True
 
@@ -266,7 +370,7 @@ def create_organization(
         print(f"  [DRY-RUN] Would create organization '{name}' ({visibility})")
         return True
 
-    resp = client.post(
+    resp = await client.post(
         "/orgs",
         {
             "username": name,
@@ -277,6 +381,7 @@ def create_organization(
 
     if resp.status_code in (200, 201):
         print(f"  Created organization '{name}'")
+        client._org_cache[name] = _known(True)
         return True
     else:
         print(f"  Failed to create organization '{name}': {resp.status_code}")
@@ -287,19 +392,23 @@ def create_organization(
         return False
 
 
-def get_team_id(client: GiteaClient, org_name: str, team_name: str) -> int | None:
-    """Get team ID by name, or None if not found."""
-    resp = client.get(f"/orgs/{org_name}/teams")
-    if resp.status_code != 200:
-        return None
-    teams = resp.json()
-    for team in teams:
-        if team.get("name") == team_name:
-            return team.get("id")
-    return None
+async def get_team_id(client: GiteaClient, org_name: str, team_name: str) -> int | None:
+    """Get team ID by name, or None if not found.
+
+    The organization's teams are listed once per run and indexed by name.
+    """
+
+    async def lookup() -> dict[str, int] | None:
+        resp = await client.get(f"/orgs/{org_name}/teams")
+        if resp.status_code != 200:
+            return None
+        return {team.get("name"): team.get("id") for team in resp.json()}
+
+    teams = await _memo(client._team_cache, org_name, lookup)
+    return teams.get(team_name) if teams is not None else None
 
 
-def create_team(
+async def create_team(
     client: GiteaClient,
     org_name: str,
     team_name: str,
@@ -307,7 +416,7 @@ def create_team(
     dry_run: bool = False,
 ) -> int | None:
     """Create a team in an organization. Returns team ID."""
-    existing_id = get_team_id(client, org_name, team_name)
+    existing_id = await get_team_id(client, org_name, team_name)
     if existing_id:
         print(f"  Team '{team_name}' already exists (id={existing_id}), skipping")
         return existing_id
@@ -317,27 +426,24 @@ def create_team(
         return -1  # Placeholder ID for dry run
 
     # Map permission to Gitea's expected values
-    perm_map = {"read": "read", "write": "write", "admin": "admin"}
-    gitea_perm = perm_map.get(permission, "read")
+    gitea_perm = TEAM_PERMISSIONS.get(permission, "read")
 
-    resp = client.post(
+    resp = await client.post(
         f"/orgs/{org_name}/teams",
         {
             "name": team_name,
             "permission": gitea_perm,
-            "units": [
-                "repo.code",
-                "repo.issues",
-                "repo.pulls",
-                "repo.releases",
-                "repo.wiki",
-            ],
+            "units": list(TEAM_UNITS),
         },
     )
 
     if resp.status_code in (200, 201):
         team_id = resp.json().get("id")
         print(f"  Created team '{team_name}' (id={team_id})")
+        # get_team_id above already resolved this org's index
+        teams = client._team_cache[org_name].result()
+        if teams is not None:
+            teams[team_name] = team_id
         return team_id
     else:
         print(f"  Failed to create team '{team_name}': {resp.status_code}")
@@ -348,29 +454,72 @@ def create_team(
         return None
 
 
-def add_team_member(
-    client: GiteaClient, team_id: int, username: str, dry_run: bool = False
+async def add_team_member(
+    client: GiteaClient,
+    team_id: int,
+    team_name: str,
+    username: str,
+    dry_run: bool = False,
 ) -> bool:
     """Add a user to a team."""
     if dry_run:
-        print(f"    [DRY-RUN] Would add '{username}' to team")
+        print(f"    [DRY-RUN] Would add '{username}' to team '{team_name}'")
         return True
 
     # Check if user exists first
-    if not user_exists(client, username):
+    if not await user_exists(client, username):
         print(f"    User '{username}' not found, skipping team assignment")
         return False
 
-    resp = client.put(f"/teams/{team_id}/members/{username}")
+    resp = await client.put(f"/teams/{team_id}/members/{username}")
 
     if resp.status_code in (200, 204):
-        print(f"    Added '{username}' to team")
+        print(f"    Added '{username}' to team '{team_name}'")
         return True
     else:
-        print(f"    Failed to add '{username}' to team: {resp.status_code}")
+        print(f"    Failed to add '{username}' to team '{team_name}': {resp.status_code}")
         return False
 
 
+async def create_team_with_members(
+    client: GiteaClient,
+    org_name: str,
+    team: dict[str, Any],
+    dry_run: bool = False,
+    sequential: bool = False,
+) -> None:
+    """Create a team, then add its members once the team ID is known."""
+    team_id = await create_team(
+        client,
+        org_name,
+        team["name"],
+        team.get("permission", "read"),
+        dry_run=dry_run,
+    )
+    if team_id:
+        await _gather(
+            [
+                add_team_member(client, team_id, team["name"], member, dry_run=dry_run)
+                for member in team.get("members", [])
+            ],
+            sequential,
+        )
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_toml_cached(path: Path, size: int, mtime_ns: int) -> dict[str, Any]:
+    """Load a TOML file; size and mtime are only part of the cache key."""
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def _parse_toml(path: Path) -> dict[str, Any]:
+    """Parse a TOML file once per (resolved path, size, mtime); later calls reuse the dict."""
+    resolved = path.resolve()
+    stat = resolved.stat()
+    return _parse_toml_cached(resolved, stat.st_size, stat.st_mtime_ns)
+
+
 def load_config(config_path: Path) -> dict[str, Any]:
     """Load and validate TOML configuration."""
     if not config_path.exists():
@@ -378,8 +527,7 @@ def load_config(config_path: Path) -> dict[str, Any]:
         print(f"Copy {EXAMPLE_CONFIG} to {config_path} and customize it.")
         sys.exit(1)
 
-    with open(config_path, "rb") as f:
-        config = tomllib.load(f)
+    config = _parse_toml(config_path)
 
     # Validate required sections
     if "gitea" not in config:
@@ -409,6 +557,16 @@ def main() -> None:
         action="store_true",
         help="Preview changes without making API calls",
     )
+    parser.add_argument(
+        "--no-async",
+        action="store_true",
+        help="Issue API calls one at a time instead of concurrently",
+    )
+    parser.add_argument(
+        "--skip-version-check",
+        action="store_true",
+        help="Skip the /version connectivity probe (always skipped with --dry-run)",
+    )
     args = parser.parse_args()
 
     # Load configuration
@@ -420,96 +578,115 @@ def main() -> None:
         print("Error: GITEA_ADMIN_PASSWORD environment variable required")
         sys.exit(1)
 
-    # Create API client
-    client = GiteaClient(
-        base_url=config["gitea"]["url"],
-        username=config["admin"]["username"],
-        password=admin_password,
-        dry_run=args.dry_run,
-    )
-
-    if args.dry_run:
-        print("=== DRY RUN MODE - No changes will be made ===\n")
+    # Per-entity lines are block-buffered and flushed at phase boundaries,
+    # so a large config doesn't cost one write (and flush) per printed line
+    if isinstance(sys.stdout, io.TextIOWrapper):
+        sys.stdout.reconfigure(line_buffering=False)
 
-    # Test connection
-    print("Connecting to Gitea...")
     try:
-        resp = client.get("/version")
-        if resp.status_code != 200:
-            print(f"Error: Could not connect to Gitea at {config['gitea']['url']}")
-            sys.exit(1)
-        version = resp.json().get("version", "unknown")
-        print(f"  Connected to Gitea v{version}\n")
+        asyncio.run(run(args, config, admin_password))
     except httpx.RequestError as e:
         print(f"Error: Could not connect to Gitea: {e}")
         sys.exit(1)
 
-    # Update admin profile if requested
-    admin_update = config.get("admin_update")
-    if admin_update:
-        print("Updating admin profile...")
-        success, actual_username = update_admin(
-            client,
-            config["admin"]["username"],
-            admin_update,
-            dry_run=args.dry_run,
-        )
-        # Update client credentials to use new username/password
-        if success:
-            client.username = actual_username
-            if admin_update.get("change_password"):
-                new_password = os.environ.get("NEW_GITEA_ADMIN_PASSWORD")
-                if new_password:
-                    client.password = new_password
-        print()
-
-    # Create users
-    users = config.get("users", [])
-    if users:
-        print("Creating users...")
-        for user in users:
-            create_user(
+
+async def run(args: argparse.Namespace, config: dict[str, Any], admin_password: str) -> None:
+    """Apply the admin, user, organization and team configuration to Gitea."""
+    sequential = args.no_async
+
+    # Create API client
+    async with GiteaClient(
+        base_url=config["gitea"]["url"],
+        username=config["admin"]["username"],
+        password=admin_password,
+        dry_run=args.dry_run,
+    ) as client:
+        if args.dry_run:
+            print("=== DRY RUN MODE - No changes will be made ===\n")
+
+        # Test connection (skipped for dry runs and --skip-version-check: an
+        # unreachable server then surfaces on the first lookup instead)
+        if not (args.dry_run or args.skip_version_check):
+            print("Connecting to Gitea...")
+            resp = await client.get("/version")
+            if resp.status_code != 200:
+                print(f"Error: Could not connect to Gitea at {config['gitea']['url']}")
+                sys.exit(1)
+            version = resp.json().get("version", "unknown")
+            print(f"  Connected to Gitea v{version} ({resp.http_version})\n", flush=True)
+
+        # Update admin profile if requested
+        admin_update = config.get("admin_update")
+        if admin_update:
+            print("Updating admin profile...")
+            success, actual_username = await update_admin(
                 client,
-                user["username"],
-                user["email"],
+                config["admin"]["username"],
+                admin_update,
                 dry_run=args.dry_run,
             )
-        print()
-
-    # Create organization
-    org_config = config.get("organization")
-    if org_config:
-        print("Creating organization...")
-        org_created = create_organization(
-            client,
-            org_config["name"],
-            org_config.get("description", ""),
-            org_config.get("visibility", "public"),
-            dry_run=args.dry_run,
-        )
+            # Update client credentials to use new username/password
+            if success:
+                password = client.password
+                if admin_update.get("change_password"):
+                    password = os.environ.get("NEW_GITEA_ADMIN_PASSWORD") or password
+                client.set_credentials(actual_username, password)
+            print(flush=True)
+
+        # Create users
+        users = config.get("users", [])
+        if users:
+            print("Creating users...")
+            passwords = env_passwords([user["username"] for user in users])
+            await _gather(
+                [
+                    create_user(
+                        client,
+                        user["username"],
+                        user["email"],
+                        dry_run=args.dry_run,
+                        preset_password=passwords.get(user["username"]),
+                    )
+                    for user in users
+                ],
+                sequential,
+            )
+            print(flush=True)
 
-        # Create teams
-        teams = org_config.get("teams", [])
-        if org_created and teams:
-            print("\nCreating teams...")
-            for team in teams:
-                team_id = create_team(
-                    client,
-                    org_config["name"],
-                    team["name"],
-                    team.get("permission", "read"),
-                    dry_run=args.dry_run,
-                )
+        # Create organization
+        org_config = config.get("organization")
+        if org_config:
+            print("Creating organization...")
+            org_created = await create_organization(
+                client,
+                org_config["name"],
+                org_config.get("description", ""),
+                org_config.get("visibility", "public"),
+                dry_run=args.dry_run,
+            )
 
-                # Add members to team
-                if team_id:
-                    members = team.get("members", [])
-                    for member in members:
-                        add_team_member(client, team_id, member, dry_run=args.dry_run)
+            # Create teams
+            teams = org_config.get("teams", [])
+            if org_created and teams:
+                print("\nCreating teams...", flush=True)
+                # Teams are independent; each adds its members after it exists
+                await _gather(
+                    [
+                        create_team_with_members(
+                            client,
+                            org_config["name"],
+                            team,
+                            dry_run=args.dry_run,
+                            sequential=sequential,
+                        )
+                        for team in teams
+                    ],
+                    sequential,
+                )
 
-    print("\nDone!")
-    if args.dry_run:
-        print("\n=== DRY RUN COMPLETE - Run without --dry-run to apply changes ===")
+        print("\nDone!")
+        if args.dry_run:
+            print("\n=== DRY RUN COMPLETE - Run without --dry-run to apply changes ===")
 
 
 if __name__ == "__main__":
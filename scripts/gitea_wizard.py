@@ -37,79 +37,155 @@ Usage (non-interactive):
 from __future__ import annotations
 
 import argparse
+import functools
+import os
+import re
 import secrets
+import shutil
 import string
 import sys
-import tomllib
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import tomli_w
+# rich and the TOML libraries are imported where they are used: --help and
+# argument errors load neither, and the non-interactive path never loads the
+# prompt machinery
+if TYPE_CHECKING:
+    from rich.console import Console, RenderableType
+    from rich.table import Table
+    from rich.text import Text
 
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
+def load_toml(path: Path) -> dict[str, Any]:
+    """Parse a TOML file (rtoml when installed, otherwise tomllib)."""
+    try:
+        import rtoml  # optional Rust-backed TOML reader/writer
+    except ImportError:
+        import tomllib
+
+        return tomllib.loads(path.read_bytes().decode())
+    return rtoml.load(path)
+
+
+def dump_toml(data: dict[str, Any], path: Path, overwrite: bool = True) -> None:
+    """Write ``data`` to a TOML file (rtoml when installed, otherwise tomli_w).
+
+    The document is serialized in memory and written with a single call. With
+    ``overwrite=False`` the file is created exclusively and FileExistsError is
+    raised if it already exists.
+    """
+    try:
+        import rtoml
+    except ImportError:
+        import tomli_w
+
+        text = tomli_w.dumps(data)
+    else:
+        text = rtoml.dumps(data, pretty=True)
+    with open(path, "wb" if overwrite else "xb") as f:
+        f.write(text.encode())
+
+
+PASSWORD_ALPHABET = string.ascii_letters + string.digits
 
 
 def generate_safe_password(length: int = 24) -> str:
-    """Generate a safe password with only alphanumeric characters."""
-    alphabet = string.ascii_letters + string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    """Generate a safe password with only alphanumeric characters.
+
+    Random bytes are drawn in bulk; each byte's low 6 bits index the 62-char
+    alphabet and the two out-of-range values are rejected, so every character
+    stays uniformly distributed.
+    """
+    chars: list[str] = []
+    while len(chars) < length:
+        chars += [
+            PASSWORD_ALPHABET[b & 63] for b in secrets.token_bytes(length * 2) if b & 63 < 62
+        ]
+    return "".join(chars[:length])
+
+
+@functools.cache
+def get_console() -> Console:
+    """Return the shared Rich console, creating it on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+def dim(line: str) -> Text:
+    """Build a dim hint line as Text, skipping the markup parser.
+
+    Leading indentation is kept unstyled, as with ``"  [dim]...[/dim]"``.
+    """
+    from rich.text import Text
+
+    body = line.lstrip(" ")
+    return Text.assemble(line[: len(line) - len(body)], (body, "dim"))
 
-console = Console()
 
 CONFIG_PATH = Path("config/setup.toml")
 ENV_PATH = Path(".env")
 
+# KEY=value assignment lines (comments and blank lines never match)
+ENV_LINE_RE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
 
+
+@functools.cache
 def load_env_defaults() -> dict[str, str]:
-    """Load defaults from .env file if it exists."""
+    """Load defaults from .env file if it exists (parsed once per process)."""
     defaults = {
         "GITEA_ADMIN": "admin",
         "GITEA_ADMIN_EMAIL": "admin@localhost",
         "GITEA_EXTERNAL_URL": "http://gitea.localhost",
     }
 
-    if ENV_PATH.exists():
-        with open(ENV_PATH) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, _, value = line.partition("=")
-                    key = key.strip()
-                    value = value.strip()
-                    if key in defaults:
-                        defaults[key] = value
+    try:
+        text = ENV_PATH.read_text()
+    except FileNotFoundError:
+        return defaults
+
+    # Later assignments win, as when the file is sourced
+    parsed = dict(ENV_LINE_RE.findall(text))
+    defaults.update({key: parsed[key] for key in defaults.keys() & parsed.keys()})
 
     return defaults
 
 
 def welcome() -> None:
     """Display welcome screen."""
-    console.print()
+    from rich.console import Group
+    from rich.panel import Panel
+
+    console = get_console()
+
     console.print(
-        Panel.fit(
-            "[bold blue]Gitea Setup Wizard[/bold blue]\n\n"
-            "This wizard will help you create [cyan]config/setup.toml[/cyan]\n"
-            "for provisioning users, organizations, and teams in Gitea.\n\n"
-            "[dim]Press Enter to accept default values shown in brackets.[/dim]",
-            title="Welcome",
-            border_style="blue",
+        Group(
+            "",
+            Panel.fit(
+                "[bold blue]Gitea Setup Wizard[/bold blue]\n\n"
+                "This wizard will help you create [cyan]config/setup.toml[/cyan]\n"
+                "for provisioning users, organizations, and teams in Gitea.\n\n"
+                "[dim]Press Enter to accept default values shown in brackets.[/dim]",
+                title="Welcome",
+                border_style="blue",
+            ),
+            "",
         )
     )
-    console.print()
 
 
 def prompt_gitea_config(env_defaults: dict[str, str]) -> dict[str, str]:
     """Prompt for Gitea server configuration."""
-    console.print("[bold]1. Gitea Server Configuration[/bold]", style="cyan")
-    console.print()
+    from rich.console import Group
+    from rich.prompt import Prompt
+
+    console = get_console()
+
+    console.print(Group("[bold cyan]1. Gitea Server Configuration[/bold cyan]", ""))
 
     url = Prompt.ask(
         "  Gitea URL",
-        default=env_defaults.get("GITEA_EXTERNAL_URL", "http://gitea.localhost"),
+        default=env_defaults["GITEA_EXTERNAL_URL"],
     )
 
     return {"url": url}
@@ -117,19 +193,28 @@ def prompt_gitea_config(env_defaults: dict[str, str]) -> dict[str, str]:
 
 def prompt_current_admin(env_defaults: dict[str, str]) -> dict[str, str]:
     """Prompt for current admin credentials (for API authentication)."""
-    console.print()
-    console.print("[bold]2. Current Admin (for API authentication)[/bold]", style="cyan")
-    console.print("  [dim]These credentials are used to connect to Gitea API.[/dim]")
-    console.print("  [dim]Values loaded from .env file.[/dim]")
-    console.print()
+    from rich.console import Group
+    from rich.prompt import Prompt
+
+    console = get_console()
+
+    console.print(
+        Group(
+            "",
+            "[bold cyan]2. Current Admin (for API authentication)[/bold cyan]",
+            dim("  These credentials are used to connect to Gitea API."),
+            dim("  Values loaded from .env file."),
+            "",
+        )
+    )
 
     username = Prompt.ask(
         "  Current admin username",
-        default=env_defaults.get("GITEA_ADMIN", "admin"),
+        default=env_defaults["GITEA_ADMIN"],
     )
     email = Prompt.ask(
         "  Current admin email",
-        default=env_defaults.get("GITEA_ADMIN_EMAIL", "admin@localhost"),
+        default=env_defaults["GITEA_ADMIN_EMAIL"],
     )
 
     return {"username": username, "email": email}
@@ -137,10 +222,19 @@ def prompt_current_admin(env_defaults: dict[str, str]) -> dict[str, str]:
 
 def prompt_admin_update(current_admin: dict[str, str]) -> dict[str, Any] | None:
     """Prompt for admin profile update (rename, change email/password)."""
-    console.print()
-    console.print("[bold]3. Update Admin Profile (optional)[/bold]", style="cyan")
-    console.print("  [dim]Optionally rename the admin user or change email/password.[/dim]")
-    console.print()
+    from rich.console import Group
+    from rich.prompt import Confirm, Prompt
+
+    console = get_console()
+
+    console.print(
+        Group(
+            "",
+            "[bold cyan]3. Update Admin Profile (optional)[/bold cyan]",
+            dim("  Optionally rename the admin user or change email/password."),
+            "",
+        )
+    )
 
     if not Confirm.ask("  Do you want to update the admin profile?", default=False):
         return None
@@ -168,11 +262,15 @@ def prompt_admin_update(current_admin: dict[str, str]) -> dict[str, Any] | None:
         update["change_password"] = True
         new_password = generate_safe_password(24)
         update["generated_password"] = new_password
-        console.print(f"    [yellow]→[/yellow] Generated new password: [cyan]{new_password}[/cyan]")
-        console.print("    [dim]    (Will be saved to .env as NEW_GITEA_ADMIN_PASSWORD)[/dim]")
+        console.print(
+            Group(
+                f"    [yellow]→[/yellow] Generated new password: [cyan]{new_password}[/cyan]",
+                dim("        (Will be saved to .env as NEW_GITEA_ADMIN_PASSWORD)"),
+            )
+        )
 
     if not update:
-        console.print("    [dim]No changes to admin profile.[/dim]")
+        console.print("    No changes to admin profile.", style="dim", markup=False)
         return None
 
     return update
@@ -180,9 +278,12 @@ def prompt_admin_update(current_admin: dict[str, str]) -> dict[str, Any] | None:
 
 def prompt_organization(step_num: int) -> dict[str, Any] | None:
     """Prompt for organization setup."""
-    console.print()
-    console.print(f"[bold]{step_num}. Organization Setup[/bold]", style="cyan")
-    console.print()
+    from rich.console import Group
+    from rich.prompt import Confirm, Prompt
+
+    console = get_console()
+
+    console.print(Group("", f"[bold cyan]{step_num}. Organization Setup[/bold cyan]", ""))
 
     if not Confirm.ask("  Do you want to create an organization?", default=True):
         return None
@@ -207,74 +308,105 @@ def prompt_organization(step_num: int) -> dict[str, Any] | None:
     }
 
     # Team creation loop
-    console.print()
-    console.print("  [bold]Teams[/bold]")
-    console.print("  [dim]Teams help organize repository access within the organization.[/dim]")
-    console.print()
+    console.print(
+        Group(
+            "",
+            "  [bold]Teams[/bold]",
+            dim("  Teams help organize repository access within the organization."),
+            "",
+        )
+    )
+
+    # Bound once for the loop
+    ask, confirm = Prompt.ask, Confirm.ask
+    permissions = ["read", "write", "admin"]
 
     while True:
-        if not Confirm.ask("  Add a team?", default=len(org["teams"]) < 2):
+        if not confirm("  Add a team?", default=len(org["teams"]) < 2):
             break
 
-        team_name = Prompt.ask("    Team name", default="developers" if not org["teams"] else "")
-        permission = Prompt.ask(
-            "    Permission level",
-            choices=["read", "write", "admin"],
-            default="write",
-        )
+        team_name = ask("    Team name", default="developers" if not org["teams"] else "")
+        permission = ask("    Permission level", choices=permissions, default="write")
 
         org["teams"].append({
             "name": team_name,
             "permission": permission,
             "members": [],  # Will be populated from users
         })
-        console.print(f"    [green]✓[/green] Added team '{team_name}' with {permission} access")
-        console.print()
+        console.print(
+            Group(f"    [green]✓[/green] Added team '{team_name}' with {permission} access", "")
+        )
 
     return org
 
 
 def prompt_users(org: dict[str, Any] | None, step_num: int) -> list[dict[str, Any]]:
     """Prompt for user creation."""
-    console.print()
-    console.print(f"[bold]{step_num}. User Creation[/bold]", style="cyan")
-    console.print("  [dim]Passwords are read from {USERNAME}_PASSWORD env vars or auto-generated.[/dim]")
-    console.print()
+    from rich.console import Group
+    from rich.prompt import Confirm, Prompt
+
+    console = get_console()
+
+    console.print(
+        Group(
+            "",
+            f"[bold cyan]{step_num}. User Creation[/bold cyan]",
+            dim("  Passwords are read from {USERNAME}_PASSWORD env vars or auto-generated."),
+            "",
+        )
+    )
 
     users: list[dict[str, Any]] = []
-    team_names = [t["name"] for t in org.get("teams", [])] if org else []
+    teams: list[dict[str, Any]] = org.get("teams", []) if org else []
+
+    # The teams are fixed by now: build the listing and the lookup once
+    team_names = [t["name"] for t in teams]
+    available = dim(f"    Available teams: {', '.join(team_names)}")
+    team_by_name = {t["name"]: t for t in teams}
+    ask, confirm = Prompt.ask, Confirm.ask
 
     while True:
-        if not Confirm.ask("  Add a user?", default=len(users) < 2):
+        if not confirm("  Add a user?", default=len(users) < 2):
             break
 
-        username = Prompt.ask("    Username")
-        email = Prompt.ask("    Email", default=f"{username}@example.com")
+        username = ask("    Username")
+        email = ask("    Email", default=f"{username}@example.com")
 
         user: dict[str, Any] = {"username": username, "email": email}
 
-        # Team assignment
-        if team_names:
-            console.print(f"    [dim]Available teams: {', '.join(team_names)}[/dim]")
-            if Confirm.ask("    Assign to teams?", default=True):
-                for team in org["teams"]:  # type: ignore
-                    if Confirm.ask(f"      Add to '{team['name']}'?", default=True):
-                        if username not in team["members"]:
-                            team["members"].append(username)
+        # Team assignment: one comma-separated answer instead of a prompt per team
+        if teams:
+            console.print(available)
+            if confirm("    Assign to teams?", default=True):
+                selected = ask("      Teams (comma-separated)", default=",".join(team_names))
+                for name in filter(None, (n.strip() for n in selected.split(","))):
+                    team = team_by_name.get(name)
+                    if team is None:
+                        console.print(f"      [yellow]⚠[/yellow] Unknown team '{name}', skipped")
+                    elif username not in team["members"]:
+                        team["members"].append(username)
 
         users.append(user)
-        console.print(f"    [green]✓[/green] Added user '{username}'")
-        console.print()
+        console.print(Group(f"    [green]✓[/green] Added user '{username}'", ""))
 
     return users
 
 
 def prompt_oauth_apps(step_num: int) -> list[dict[str, Any]]:
     """Prompt for OAuth app configuration."""
-    console.print()
-    console.print(f"[bold]{step_num}. OAuth Applications[/bold]", style="cyan")
-    console.print("  [dim]OAuth apps allow external services to authenticate via Gitea.[/dim]")
-    console.print()
+    from rich.console import Group
+    from rich.prompt import Confirm, Prompt
+
+    console = get_console()
+
+    console.print(
+        Group(
+            "",
+            f"[bold cyan]{step_num}. OAuth Applications[/bold cyan]",
+            dim("  OAuth apps allow external services to authenticate via Gitea."),
+            "",
+        )
+    )
 
     apps: list[dict[str, Any]] = []
 
@@ -291,66 +423,91 @@ def prompt_oauth_apps(step_num: int) -> list[dict[str, Any]]:
         })
         console.print("    [green]✓[/green] Added Woodpecker CI OAuth app")
 
-    # Additional apps
+    # Additional apps: one line each, in the same form as --oauth
+    console.print(
+        Group("", dim("  More apps as NAME:REDIRECT_URI[:public|confidential], blank to finish."))
+    )
+    while spec := Prompt.ask("  Another OAuth app", default="", show_default=False):
+        app = parse_oauth_spec(spec)
+        if app is None:
+            console.print("    [yellow]⚠[/yellow] Expected NAME:REDIRECT_URI[:public|confidential]")
+            continue
+        apps.append(app)
+        console.print(f"    [green]✓[/green] Added '{app['name']}' OAuth app")
     console.print()
-    while Confirm.ask("  Add another OAuth app?", default=False):
-        name = Prompt.ask("    App name")
-        redirect = Prompt.ask("    Redirect URI")
-        confidential = Confirm.ask("    Confidential client?", default=True)
-
-        apps.append({
-            "name": name,
-            "redirect_uri": redirect,
-            "confidential": confidential,
-        })
-        console.print(f"    [green]✓[/green] Added '{name}' OAuth app")
-        console.print()
 
     return apps
 
 
-def show_summary(config: dict[str, Any]) -> None:
-    """Display configuration summary."""
-    console.print()
-    console.print(Panel("[bold]Configuration Summary[/bold]", style="cyan"))
-    console.print()
+def kv_table(title: str, rows: list[tuple[str, RenderableType]]) -> Table:
+    """Build a headerless two-column (dim key, value) summary table."""
+    from rich.table import Table
 
-    # Gitea & Admin
-    table = Table(title="Server & Current Admin", show_header=False, box=None)
+    table = Table(title=title, show_header=False, box=None)
     table.add_column("Key", style="dim")
     table.add_column("Value")
-    table.add_row("Gitea URL", config["gitea"]["url"])
-    table.add_row("Admin User", config["admin"]["username"])
-    table.add_row("Admin Email", config["admin"]["email"])
-    console.print(table)
-    console.print()
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+
+def show_summary(config: dict[str, Any]) -> None:
+    """Display configuration summary.
+
+    Every section is collected first and written with a single print.
+    """
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.text import Text
+
+    console = get_console()
+
+    # Fixed cell values, styled directly so no row re-parses their markup
+    none = Text("none", style="dim")
+    will_change = Text("Will be changed", style="yellow")
+
+    parts: list[RenderableType] = [
+        "",
+        Panel("[bold]Configuration Summary[/bold]", style="cyan"),
+        "",
+    ]
+
+    # Gitea & Admin
+    table = kv_table(
+        "Server & Current Admin",
+        [
+            ("Gitea URL", config["gitea"]["url"]),
+            ("Admin User", config["admin"]["username"]),
+            ("Admin Email", config["admin"]["email"]),
+        ],
+    )
+    parts += [table, ""]
 
     # Admin Update
     if config.get("admin_update"):
-        table = Table(title="Admin Profile Updates", show_header=False, box=None)
-        table.add_column("Change", style="dim")
-        table.add_column("Value")
         update = config["admin_update"]
+        changes = []
         if update.get("new_username"):
-            table.add_row("Rename to", update["new_username"])
+            changes.append(("Rename to", update["new_username"]))
         if update.get("new_email"):
-            table.add_row("New email", update["new_email"])
+            changes.append(("New email", update["new_email"]))
         if update.get("change_password"):
-            table.add_row("Password", "[yellow]Will be changed[/yellow]")
-        console.print(table)
-        console.print()
+            changes.append(("Password", will_change))
+        parts += [kv_table("Admin Profile Updates", changes), ""]
 
     # Organization
     if config.get("organization"):
         org = config["organization"]
-        table = Table(title="Organization", show_header=False, box=None)
-        table.add_column("Key", style="dim")
-        table.add_column("Value")
-        table.add_row("Name", org["name"])
-        table.add_row("Visibility", org["visibility"])
-        table.add_row("Description", org.get("description", ""))
-        console.print(table)
-        console.print()
+        table = kv_table(
+            "Organization",
+            [
+                ("Name", org["name"]),
+                ("Visibility", org["visibility"]),
+                ("Description", org.get("description", "")),
+            ],
+        )
+        parts += [table, ""]
 
         # Teams
         if org.get("teams"):
@@ -358,21 +515,23 @@ def show_summary(config: dict[str, Any]) -> None:
             table.add_column("Name")
             table.add_column("Permission")
             table.add_column("Members")
-            for team in org["teams"]:
-                members = ", ".join(team.get("members", [])) or "[dim]none[/dim]"
-                table.add_row(team["name"], team["permission"], members)
-            console.print(table)
-            console.print()
+            rows = [
+                (t["name"], t["permission"], ", ".join(t.get("members", [])) or none)
+                for t in org["teams"]
+            ]
+            for row in rows:
+                table.add_row(*row)
+            parts += [table, ""]
 
     # Users
     if config.get("users"):
         table = Table(title="Users")
         table.add_column("Username")
         table.add_column("Email")
-        for user in config["users"]:
-            table.add_row(user["username"], user["email"])
-        console.print(table)
-        console.print()
+        rows = [(u["username"], u["email"]) for u in config["users"]]
+        for row in rows:
+            table.add_row(*row)
+        parts += [table, ""]
 
     # OAuth Apps
     if config.get("oauth_apps"):
@@ -380,11 +539,15 @@ def show_summary(config: dict[str, Any]) -> None:
         table.add_column("Name")
         table.add_column("Redirect URI")
         table.add_column("Type")
-        for app in config["oauth_apps"]:
-            app_type = "Confidential" if app.get("confidential", True) else "Public"
-            table.add_row(app["name"], app["redirect_uri"], app_type)
-        console.print(table)
-        console.print()
+        rows = [
+            (a["name"], a["redirect_uri"], "Confidential" if a.get("confidential", True) else "Public")
+            for a in config["oauth_apps"]
+        ]
+        for row in rows:
+            table.add_row(*row)
+        parts += [table, ""]
+
+    console.print(Group(*parts))
 
 
 def build_toml_config(config: dict[str, Any]) -> dict[str, Any]:
@@ -394,64 +557,71 @@ def build_toml_config(config: dict[str, Any]) -> dict[str, Any]:
         "admin": config["admin"],
     }
 
-    if config.get("admin_update"):
-        # Don't include generated_password in TOML (it goes to .env)
-        admin_update = {k: v for k, v in config["admin_update"].items() if k != "generated_password"}
+    if admin_update := config.get("admin_update"):
+        # Don't include generated_password in TOML (it goes to .env); the
+        # section is only copied when there is something to drop
+        if "generated_password" in admin_update:
+            admin_update = {k: v for k, v in admin_update.items() if k != "generated_password"}
         if admin_update:
             toml_config["admin_update"] = admin_update
 
-    if config.get("organization"):
-        org = config["organization"]
-        toml_config["organization"] = {
+    if org := config.get("organization"):
+        org_out = toml_config["organization"] = {
             "name": org["name"],
             "description": org.get("description", ""),
             "visibility": org["visibility"],
         }
-        if org.get("teams"):
+        if teams := org.get("teams"):
             # Teams go as array of tables
-            toml_config["organization"]["teams"] = org["teams"]
+            org_out["teams"] = teams
 
-    if config.get("users"):
-        toml_config["users"] = config["users"]
+    if users := config.get("users"):
+        toml_config["users"] = users
 
-    if config.get("oauth_apps"):
-        toml_config["oauth_apps"] = config["oauth_apps"]
+    if oauth_apps := config.get("oauth_apps"):
+        toml_config["oauth_apps"] = oauth_apps
 
     return toml_config
 
 
 def update_env_file(key: str, value: str) -> bool:
-    """Update or append a key in .env file."""
-    if not ENV_PATH.exists():
+    """Update or append a key in .env file.
+
+    A new key is appended in place; an existing one is substituted in a single
+    regex pass and the file is swapped in atomically (keeping its mode).
+    """
+    try:
+        content = ENV_PATH.read_bytes()
+    except FileNotFoundError:
         return False
 
-    content = ENV_PATH.read_text()
-    lines = content.splitlines()
-    new_lines = []
-    found = False
-
-    for line in lines:
-        if line.startswith(f"{key}="):
-            new_lines.append(f"{key}={value}")
-            found = True
-        else:
-            new_lines.append(line)
-
-    if not found:
-        new_lines.append(f"{key}={value}")
-
-    ENV_PATH.write_text("\n".join(new_lines) + "\n")
+    line = f"{key}={value}".encode()
+    pattern = re.compile(rb"^" + re.escape(key.encode()) + rb"=.*$", re.MULTILINE)
+    if not pattern.search(content):
+        with ENV_PATH.open("ab") as f:
+            if content and not content.endswith(b"\n"):
+                f.write(b"\n")
+            f.write(line + b"\n")
+        return True
+
+    content = pattern.sub(lambda _: line, content)
+    # The temp copy holds secrets: create it owner-only, then take .env's mode
+    tmp = ENV_PATH.with_name(f"{ENV_PATH.name}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+    shutil.copymode(ENV_PATH, tmp)
+    os.replace(tmp, ENV_PATH)
     return True
 
 
 def write_config(config: dict[str, Any]) -> bool:
     """Write configuration to file."""
-    # Check for existing file
-    if CONFIG_PATH.exists():
-        console.print(f"[yellow]Warning:[/yellow] {CONFIG_PATH} already exists.")
-        if not Confirm.ask("Overwrite existing file?", default=False):
-            console.print("[dim]Cancelled. Existing file preserved.[/dim]")
-            return False
+    from rich.prompt import Confirm
+
+    console = get_console()
 
     # Ensure directory exists
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -459,15 +629,22 @@ def write_config(config: dict[str, Any]) -> bool:
     # Build TOML structure
     toml_config = build_toml_config(config)
 
-    # Write file
-    with open(CONFIG_PATH, "wb") as f:
-        tomli_w.dump(toml_config, f)
+    # Write file, asking before replacing an existing one
+    try:
+        dump_toml(toml_config, CONFIG_PATH, overwrite=False)
+    except FileExistsError:
+        console.print(f"[yellow]Warning:[/yellow] {CONFIG_PATH} already exists.")
+        if not Confirm.ask("Overwrite existing file?", default=False):
+            console.print("Cancelled. Existing file preserved.", style="dim", markup=False)
+            return False
+        dump_toml(toml_config, CONFIG_PATH)
 
     return True
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+@functools.cache
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser (constructed once per process)."""
     parser = argparse.ArgumentParser(
         description="Gitea Setup Wizard - Generate config/setup.toml",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -590,17 +767,42 @@ Examples:
     parser.add_argument(
         "--oauth",
         action="append",
+        type=oauth_spec_arg,
         metavar="NAME:REDIRECT:TYPE",
         help="Add OAuth app as 'name:redirect_uri:confidential|public'",
     )
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_from_toml_args(argv: list[str]) -> argparse.Namespace | None:
+    """Recognize the plain ``--from-toml FILE [-y]`` invocation without argparse.
+
+    Returns None for any other shape, which then goes through the full parser.
+    """
+    rest = [arg for arg in argv if arg not in ("-y", "--overwrite")]
+    if len(rest) != 2 or rest[0] != "--from-toml" or rest[1].startswith("-"):
+        return None
+    return argparse.Namespace(
+        non_interactive=False,
+        from_toml=Path(rest[1]),
+        overwrite=len(rest) != len(argv),
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parse_from_toml_args(argv)
+    if args is None:
+        args = build_parser().parse_args(argv)
+    return args
 
 
 def load_from_toml(path: Path) -> dict[str, Any]:
     """Load configuration from existing TOML file."""
-    with open(path, "rb") as f:
-        toml_data = tomllib.load(f)
+    toml_data = load_toml(path)
 
     config: dict[str, Any] = {
         "gitea": toml_data.get("gitea", {"url": "http://gitea.localhost"}),
@@ -635,6 +837,36 @@ def load_from_toml(path: Path) -> dict[str, Any]:
     return config
 
 
+def parse_oauth_spec(spec: str) -> dict[str, Any] | None:
+    """Parse 'NAME:REDIRECT_URI[:public|confidential]' (None if malformed)."""
+    name, sep, rest = spec.partition(":")
+    if not sep:
+        return None
+    # The redirect URI has colons of its own (http://...); only a trailing
+    # ':public' / ':confidential' is the client type
+    redirect_uri, sep, app_type = rest.rpartition(":")
+    if not sep or app_type.lower() not in ("public", "confidential"):
+        redirect_uri, app_type = rest, "confidential"
+    name, redirect_uri = name.strip(), redirect_uri.strip()
+    if not name or not redirect_uri:
+        return None
+    return {
+        "name": name,
+        "redirect_uri": redirect_uri,
+        "confidential": app_type.lower() != "public",
+    }
+
+
+def oauth_spec_arg(spec: str) -> dict[str, Any]:
+    """argparse type for --oauth: a parsed app, or a usage error if malformed."""
+    app = parse_oauth_spec(spec)
+    if app is None:
+        raise argparse.ArgumentTypeError(
+            f"expected NAME:REDIRECT_URI[:public|confidential], got {spec!r}"
+        )
+    return app
+
+
 def build_config_from_args(args: argparse.Namespace) -> dict[str, Any]:
     """Build configuration from command line arguments."""
     config: dict[str, Any] = {
@@ -666,11 +898,12 @@ def build_config_from_args(args: argparse.Namespace) -> dict[str, Any]:
         # Parse teams
         if args.team:
             for team_str in args.team:
-                parts = team_str.split(":")
-                if len(parts) >= 2:
-                    name = parts[0]
-                    permission = parts[1] if parts[1] in ("read", "write", "admin") else "write"
-                    members = parts[2].split(",") if len(parts) > 2 and parts[2] else []
+                name, sep, rest = team_str.partition(":")
+                if sep:
+                    permission, _, members_str = rest.partition(":")
+                    if permission not in ("read", "write", "admin"):
+                        permission = "write"
+                    members = members_str.split(",") if members_str else []
                     config["organization"]["teams"].append({
                         "name": name,
                         "permission": permission,
@@ -681,9 +914,9 @@ def build_config_from_args(args: argparse.Namespace) -> dict[str, Any]:
     if args.user:
         config["users"] = []
         for user_str in args.user:
-            parts = user_str.split(":")
-            username = parts[0]
-            email = parts[1] if len(parts) > 1 else f"{username}@example.com"
+            username, sep, email = user_str.partition(":")
+            if not sep:
+                email = f"{username}@example.com"
             config["users"].append({"username": username, "email": email})
 
     # OAuth apps
@@ -695,24 +928,7 @@ def build_config_from_args(args: argparse.Namespace) -> dict[str, Any]:
             "confidential": True,
         })
     if args.oauth:
-        for oauth_str in args.oauth:
-            parts = oauth_str.split(":")
-            if len(parts) >= 2:
-                name = parts[0]
-                redirect_uri = parts[1]
-                # Handle redirect URIs with colons (http://...)
-                if len(parts) > 3:
-                    redirect_uri = ":".join(parts[1:-1])
-                    confidential = parts[-1].lower() != "public"
-                elif len(parts) == 3:
-                    confidential = parts[2].lower() != "public"
-                else:
-                    confidential = True
-                oauth_apps.append({
-                    "name": name,
-                    "redirect_uri": redirect_uri,
-                    "confidential": confidential,
-                })
+        oauth_apps += args.oauth
     if oauth_apps:
         config["oauth_apps"] = oauth_apps
 
@@ -721,46 +937,55 @@ def build_config_from_args(args: argparse.Namespace) -> dict[str, Any]:
 
 def run_non_interactive(args: argparse.Namespace) -> None:
     """Run wizard in non-interactive mode."""
-    # Load config from TOML or args
-    if args.from_toml:
-        if not args.from_toml.exists():
-            console.print(f"[red]Error:[/red] File not found: {args.from_toml}")
-            sys.exit(1)
-        console.print(f"Loading configuration from [cyan]{args.from_toml}[/cyan]")
-        config = load_from_toml(args.from_toml)
-    else:
-        config = build_config_from_args(args)
-
-    # Show summary
-    show_summary(config)
-
-    # Check for existing file
-    if CONFIG_PATH.exists() and not args.overwrite:
-        console.print(f"\n[yellow]Warning:[/yellow] {CONFIG_PATH} already exists.")
-        console.print("Use --overwrite (-y) to replace it.")
-        sys.exit(1)
-
-    # Write config
-    CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    toml_config = build_toml_config(config)
-    with open(CONFIG_PATH, "wb") as f:
-        tomli_w.dump(toml_config, f)
-
-    console.print(f"\n[green]✓[/green] Configuration written to [cyan]{CONFIG_PATH}[/cyan]")
-
-    # Save generated password to .env if present
-    admin_update = config.get("admin_update", {})
-    generated_password = admin_update.get("generated_password")
-    if generated_password:
-        if update_env_file("NEW_GITEA_ADMIN_PASSWORD", generated_password):
-            console.print(f"[green]✓[/green] Saved NEW_GITEA_ADMIN_PASSWORD to .env: [cyan]{generated_password}[/cyan]")
-        else:
-            console.print("[yellow]⚠[/yellow] Could not save password to .env")
-            console.print(f"  Generated password: [cyan]{generated_password}[/cyan]")
+    console = get_console()
+
+    # The whole transcript is rendered in memory and written to stdout once,
+    # also when an error exits early
+    capture = console.capture()
+    try:
+        with capture:
+            # Load config from TOML or args
+            if args.from_toml:
+                try:
+                    config = load_from_toml(args.from_toml)
+                except FileNotFoundError:
+                    console.print(f"[red]Error:[/red] File not found: {args.from_toml}")
+                    sys.exit(1)
+                console.print(f"Loading configuration from [cyan]{args.from_toml}[/cyan]")
+            else:
+                config = build_config_from_args(args)
+
+            # Show summary
+            show_summary(config)
+
+            # Write config (an existing file is only replaced with --overwrite)
+            CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            toml_config = build_toml_config(config)
+            try:
+                dump_toml(toml_config, CONFIG_PATH, overwrite=args.overwrite)
+            except FileExistsError:
+                console.print(f"\n[yellow]Warning:[/yellow] {CONFIG_PATH} already exists.")
+                console.print("Use --overwrite (-y) to replace it.")
+                sys.exit(1)
+
+            console.print(f"\n[green]✓[/green] Configuration written to [cyan]{CONFIG_PATH}[/cyan]")
+
+            # Save generated password to .env if present
+            admin_update = config.get("admin_update", {})
+            generated_password = admin_update.get("generated_password")
+            if generated_password:
+                if update_env_file("NEW_GITEA_ADMIN_PASSWORD", generated_password):
+                    console.print(f"[green]✓[/green] Saved NEW_GITEA_ADMIN_PASSWORD to .env: [cyan]{generated_password}[/cyan]")
+                else:
+                    console.print("[yellow]⚠[/yellow] Could not save password to .env")
+                    console.print(f"  Generated password: [cyan]{generated_password}[/cyan]")
 
-    console.print("\nNext steps:")
-    console.print("  1. Run [cyan]just setup-dry-run[/cyan] to preview")
-    console.print("  2. Run [cyan]just setup[/cyan] to apply")
+            console.print("\nNext steps:")
+            console.print("  1. Run [cyan]just setup-dry-run[/cyan] to preview")
+            console.print("  2. Run [cyan]just setup[/cyan] to apply")
+    finally:
+        sys.stdout.write(capture.get())
+        sys.stdout.flush()
 
 
 def main() -> None:
@@ -771,6 +996,11 @@ def main() -> None:
         run_non_interactive(args)
         return
 
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+
+    console = get_console()
     welcome()
 
     # Load defaults from .env
@@ -808,20 +1038,21 @@ def main() -> None:
     # Confirm and write
     console.print()
     if not Confirm.ask("Write configuration to config/setup.toml?", default=True):
-        console.print("[dim]Cancelled. No files written.[/dim]")
+        console.print("Cancelled. No files written.", style="dim", markup=False)
         sys.exit(0)
 
     if write_config(config):
-        console.print()
+        # Closing messages are collected and printed together
+        parts: list[RenderableType] = [""]
 
         # Save generated password to .env if present
-        admin_update = config.get("admin_update", {})
+        admin_update = config.get("admin_update") or {}
         generated_password = admin_update.get("generated_password")
         if generated_password:
             if update_env_file("NEW_GITEA_ADMIN_PASSWORD", generated_password):
-                console.print("[green]✓[/green] Saved NEW_GITEA_ADMIN_PASSWORD to .env")
+                parts.append("[green]✓[/green] Saved NEW_GITEA_ADMIN_PASSWORD to .env")
             else:
-                console.print("[yellow]⚠[/yellow] Could not save password to .env")
+                parts.append("[yellow]⚠[/yellow] Could not save password to .env")
 
         # Build next steps based on config
         next_steps = "Next steps:\n"
@@ -830,7 +1061,7 @@ def main() -> None:
         next_steps += "  2. Run [cyan]just setup-dry-run[/cyan] to preview\n"
         next_steps += "  3. Run [cyan]just setup[/cyan] to apply"
 
-        console.print(
+        parts.append(
             Panel.fit(
                 f"[green]✓[/green] Configuration written to [cyan]{CONFIG_PATH}[/cyan]\n\n"
                 + next_steps,
@@ -838,6 +1069,7 @@ def main() -> None:
                 border_style="green",
             )
         )
+        console.print(Group(*parts))
 
 
 if __name__ == "__main__":
@@ -20,43 +20,178 @@ Usage:
     # Search for tools by keyword
     uv run servers/_discovery.py search "screenshot"
 
+    # Search tool names only (no tool files are parsed)
+    uv run servers/_discovery.py search "screen" --names
+
     # Get tool details
     uv run servers/_discovery.py detail playwright screenshot
 """
 
 import ast
+import functools
+import hashlib
 import json
+import os
+import pickle
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SERVERS_DIR = Path(__file__).parent
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "siai-discovery"
+SCRIPT_MTIME_NS = Path(__file__).stat().st_mtime_ns
+
+# Python files in a server directory that are not tools
+SKIP_FILES = frozenset({"models.py", "types.py"})
+
+# Below this many tool files a thread pool costs more than it saves
+PARALLEL_MIN_FILES = 16
+
+
+def _dump_json(obj, indent: bool = True) -> str:
+    """Serialize a result as JSON (orjson when installed, otherwise json)."""
+    try:
+        import orjson  # optional, C-implemented
+    except ImportError:
+        return json.dumps(obj, indent=2 if indent else None, default=str)
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, default=str, option=option).decode()
+
+
+def _extract_meta(content: str) -> dict:
+    """Parse a tool file and pull out its module docstring and main function."""
+    tree = ast.parse(content)
+    meta = {"module_doc": ast.get_docstring(tree), "function": None, "function_doc": None}
+
+    # The tool's entry point is a top-level async function, so only the
+    # module body is scanned (no descent into classes or function bodies)
+    func = next(
+        (
+            node
+            for node in tree.body
+            if isinstance(node, ast.AsyncFunctionDef) and not node.name.startswith("_")
+        ),
+        None,
+    )
+    if func is not None:
+        meta["function"] = func.name
+        meta["function_doc"] = ast.get_docstring(func)
+    return meta
+
+
+def _load_tool_meta(py_file: Path) -> dict:
+    """
+    Get a tool file's metadata through an on-disk pickle cache.
+
+    There is one entry per tool file, named after its resolved path. The entry
+    records the file's size and mtime plus the interpreter's cache tag and this
+    script's own mtime, so an edited file (or a new Python, or a change to the
+    extraction) is parsed again and its entry overwritten rather than added
+    alongside. A file that cannot be read or parsed yields {"error": ...}.
+    """
+    try:
+        resolved = py_file.resolve()
+        stat = resolved.stat()
+    except OSError as e:
+        return {"error": str(e)}
+
+    stamp = f"{stat.st_size}:{stat.st_mtime_ns}:{sys.implementation.cache_tag}:{SCRIPT_MTIME_NS}"
+    path_key = hashlib.blake2b(str(resolved).encode(), digest_size=16).hexdigest()
+    target = CACHE_DIR / f"meta-{path_key}.pkl"
+    try:
+        cached = pickle.loads(target.read_bytes())
+        if cached["stamp"] == stamp:
+            return cached["meta"]
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError):
+        pass
+
+    try:
+        meta = _extract_meta(py_file.read_text())
+    except Exception as e:
+        meta = {"error": str(e)}
+
+    _write_cache(target, {"stamp": stamp, "meta": meta})
+    return meta
+
+
+def _write_cache(target: Path, value) -> None:
+    """Pickle a value into CACHE_DIR atomically; failures only cost a later rebuild."""
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps(value, protocol=5))
+        os.replace(tmp, target)
+    except OSError:
+        pass
+
+
+def _readme_description(readme: Path) -> str:
+    """First non-empty line after a README's title ("" if there is none)."""
+    try:
+        f = readme.open()
+    except FileNotFoundError:
+        return ""
+
+    # Read no further than the line we are after
+    with f:
+        after_title = False
+        for line in f:
+            if not after_title:
+                after_title = line.startswith("#")
+            elif line.strip() and not line.startswith("#"):
+                return line.strip().rstrip(".")
+    return ""
+
+
+@functools.lru_cache(maxsize=1)
+def _server_names(mtime_ns: int) -> tuple[str, ...]:
+    """
+    Names of the server directories, in directory order.
+
+    Memoized on SERVERS_DIR's mtime, which changes whenever a server directory
+    is added, removed or renamed.
+    """
+    with os.scandir(SERVERS_DIR) as entries:
+        return tuple(entry.name for entry in entries if entry.is_dir() and entry.name[0] != "_")
+
+
+@functools.lru_cache(maxsize=64)
+def _tool_files(server_path: Path, mtime_ns: int) -> tuple[str, ...]:
+    """
+    Paths of a server's tool files, sorted by tool name.
+
+    Memoized on the directory's mtime, which changes whenever a file in it is
+    added, removed or renamed.
+    """
+    tool_files = []
+    # Filter on the directory entries' names, without building a Path per entry
+    with os.scandir(server_path) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(".py"):
+                continue
+            if name[0] == "_" or name in SKIP_FILES:
+                continue
+            tool_files.append((name[:-3], entry.path))
+
+    # Sort by tool name (names are unique, so paths never compare)
+    tool_files.sort()
+    return tuple(path for _, path in tool_files)
 
 
 def list_servers() -> list[dict]:
     """List all available MCP servers."""
     servers = []
-    for path in SERVERS_DIR.iterdir():
-        if path.is_dir() and not path.name.startswith("_"):
-            readme = path / "README.md"
-            description = ""
-            if readme.exists():
-                # Get first non-empty line after title
-                lines = readme.read_text().split("\n")
-                for i, line in enumerate(lines):
-                    if line.startswith("#") and i + 1 < len(lines):
-                        for next_line in lines[i + 1 :]:
-                            if next_line.strip() and not next_line.startswith("#"):
-                                description = next_line.strip().rstrip(".")
-                                break
-                        break
-
-            servers.append(
-                {
-                    "name": path.name,
-                    "description": description or f"{path.name} server",
-                    "path": f"servers/{path.name}/",
-                }
-            )
+    for name in _server_names(SERVERS_DIR.stat().st_mtime_ns):
+        description = _readme_description(SERVERS_DIR / name / "README.md")
+
+        servers.append(
+            {
+                "name": name,
+                "description": description or f"{name} server",
+                "path": f"servers/{name}/",
+            }
+        )
     return servers
 
 
@@ -70,72 +205,122 @@ def list_tools(server_name: str, detail_level: str = "name") -> list[dict]:
         - "full": Full signature and docstring
     """
     server_path = SERVERS_DIR / server_name
-    if not server_path.exists():
+    try:
+        tool_files = _tool_files(server_path, server_path.stat().st_mtime_ns)
+    except OSError:
         return [{"error": f"Server '{server_name}' not found"}]
 
-    tools = []
-    for py_file in server_path.glob("*.py"):
-        if py_file.name.startswith("_") or py_file.name in ("models.py", "types.py"):
-            continue
-
-        tool_name = py_file.stem
-        tool_info = {"name": tool_name}
-
-        if detail_level in ("description", "full"):
-            # Parse the file to get docstring
-            try:
-                content = py_file.read_text()
-                tree = ast.parse(content)
-
-                # Get module docstring
-                module_doc = ast.get_docstring(tree)
-                if module_doc:
-                    # First line is description
-                    tool_info["description"] = module_doc.split("\n")[0]
-
-                if detail_level == "full":
-                    tool_info["docstring"] = module_doc
-                    # Find async function signatures
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.AsyncFunctionDef):
-                            if not node.name.startswith("_"):
-                                tool_info["function"] = node.name
-                                tool_info["file"] = f"servers/{server_name}/{py_file.name}"
-                                break
-            except Exception as e:
-                tool_info["error"] = str(e)
-
-        tools.append(tool_info)
-
-    return sorted(tools, key=lambda x: x["name"])
-
-
-def search_tools(query: str) -> list[dict]:
-    """Search for tools across all servers by keyword."""
-    query_lower = query.lower()
-    results = []
+    describe = functools.partial(_tool_info, server_name, detail_level=detail_level)
+    if detail_level == "name" or len(tool_files) < PARALLEL_MIN_FILES:
+        return [describe(py_file) for py_file in tool_files]
 
-    for server in list_servers():
-        server_name = server["name"]
-        tools = list_tools(server_name, detail_level="description")
+    # Many files to read (and, on a cold cache, parse): overlap them
+    with ThreadPoolExecutor() as pool:
+        return list(pool.map(describe, tool_files))
 
-        for tool in tools:
+
+def _tool_info(server_name: str, py_file: str, detail_level: str) -> dict:
+    """Describe one tool file at the given detail level (see list_tools)."""
+    file_name = os.path.basename(py_file)
+    tool_info = {"name": file_name[:-3]}
+
+    if detail_level in ("description", "full"):
+        # Docstrings come from the parsed file (cached across runs)
+        meta = _load_tool_meta(Path(py_file))
+        if "error" in meta:
+            tool_info["error"] = meta["error"]
+        else:
+            module_doc = meta["module_doc"]
+            if module_doc:
+                # First line is description
+                tool_info["description"] = module_doc.split("\n")[0]
+
+            if detail_level == "full":
+                tool_info["docstring"] = module_doc
+                if meta["function"]:
+                    tool_info["function"] = meta["function"]
+                    tool_info["file"] = f"servers/{server_name}/{file_name}"
+
+    return tool_info
+
+
+def _search_index() -> list[tuple[str, str, dict]]:
+    """
+    Get one (name_lower, description_lower, row) entry per tool across all servers.
+
+    The rows are pickled to CACHE_DIR (one index per servers directory) with a
+    signature over every server's tool files (path, size, mtime), so a query
+    against an unchanged tree loads one file instead of describing each tool.
+    Names and descriptions are lowercased here, once, rather than per query.
+    """
+    server_names = [server["name"] for server in list_servers()]
+
+    signature = hashlib.blake2b(
+        f"{sys.implementation.cache_tag}:{SCRIPT_MTIME_NS}".encode(), digest_size=16
+    )
+    for server_name in server_names:
+        signature.update(f"{server_name}\n".encode())
+        server_path = SERVERS_DIR / server_name
+        for py_file in _tool_files(server_path, server_path.stat().st_mtime_ns):
+            stat = os.stat(py_file)
+            signature.update(f"{py_file}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    signature = signature.hexdigest()
+
+    tree_key = hashlib.blake2b(str(SERVERS_DIR.resolve()).encode(), digest_size=8).hexdigest()
+    index_file = CACHE_DIR / f"index-{tree_key}.pkl"
+    try:
+        cached = pickle.loads(index_file.read_bytes())
+        if cached["signature"] == signature:
+            return cached["entries"]
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError):
+        pass
+
+    entries = []
+    for server_name in server_names:
+        for tool in list_tools(server_name, detail_level="description"):
             if "error" in tool:
                 continue
+            description = tool.get("description", "")
+            row = {
+                "server": server_name,
+                "tool": tool["name"],
+                "description": description,
+                "path": f"servers/{server_name}/{tool['name']}.py",
+            }
+            entries.append((tool["name"].lower(), description.lower(), row))
+
+    _write_cache(index_file, {"signature": signature, "entries": entries})
+    return entries
+
+
+def search_tools(query: str, names_only: bool = False) -> list[dict]:
+    """
+    Search for tools across all servers by keyword.
 
-            # Search in name and description
-            name_match = query_lower in tool["name"].lower()
-            desc_match = query_lower in tool.get("description", "").lower()
+    With names_only, only tool names are matched: the tool files are listed
+    but never read or parsed, and results carry no description.
+    """
+    query_lower = query.lower()
+    results = []
 
-            if name_match or desc_match:
-                results.append(
-                    {
-                        "server": server_name,
-                        "tool": tool["name"],
-                        "description": tool.get("description", ""),
-                        "path": f"servers/{server_name}/{tool['name']}.py",
-                    }
-                )
+    if names_only:
+        for server in list_servers():
+            server_name = server["name"]
+            for tool in list_tools(server_name):
+                if query_lower in tool["name"].lower():
+                    results.append(
+                        {
+                            "server": server_name,
+                            "tool": tool["name"],
+                            "path": f"servers/{server_name}/{tool['name']}.py",
+                        }
+                    )
+        return results
+
+    for name_lower, desc_lower, row in _search_index():
+        # Search in name, then description (skipped when the name matches)
+        if query_lower in name_lower or query_lower in desc_lower:
+            results.append(row)
 
     return results
 
@@ -146,29 +331,21 @@ def get_tool_detail(server_name: str, tool_name: str) -> dict:
     if not tool_path.exists():
         return {"error": f"Tool '{tool_name}' not found in server '{server_name}'"}
 
-    content = tool_path.read_text()
-
-    try:
-        tree = ast.parse(content)
-        module_doc = ast.get_docstring(tree)
-
-        # Find the main function
-        for node in ast.walk(tree):
-            if isinstance(node, ast.AsyncFunctionDef) and not node.name.startswith("_"):
-                func_doc = ast.get_docstring(node)
-                return {
-                    "server": server_name,
-                    "tool": tool_name,
-                    "function": node.name,
-                    "module_doc": module_doc,
-                    "function_doc": func_doc,
-                    "file": f"servers/{server_name}/{tool_name}.py",
-                    "usage": f"uv run servers/playwright/run.py {tool_name.replace('_', '-')} <args>",
-                }
-    except Exception as e:
-        return {"error": str(e)}
+    meta = _load_tool_meta(tool_path)
+    if "error" in meta:
+        return {"error": meta["error"]}
+    if meta["function"] is None:
+        return {"error": "No async function found"}
 
-    return {"error": "No async function found"}
+    return {
+        "server": server_name,
+        "tool": tool_name,
+        "function": meta["function"],
+        "module_doc": meta["module_doc"],
+        "function_doc": meta["function_doc"],
+        "file": f"servers/{server_name}/{tool_name}.py",
+        "usage": f"uv run servers/playwright/run.py {tool_name.replace('_', '-')} <args>",
+    }
 
 
 def main():
@@ -178,7 +355,7 @@ def main():
         print("Commands:")
         print("  servers              - List all available servers")
         print("  tools <server>       - List tools in a server")
-        print("  search <query>       - Search for tools by keyword")
+        print("  search <query>       - Search for tools by keyword (--names: names only)")
         print("  detail <server> <tool> - Get full tool details")
         print()
         print("Examples:")
@@ -202,7 +379,7 @@ def main():
         if len(sys.argv) < 3:
             print("Usage: search <query>")
             sys.exit(1)
-        result = search_tools(sys.argv[2])
+        result = search_tools(sys.argv[2], names_only="--names" in sys.argv)
     elif cmd == "detail":
         if len(sys.argv) < 4:
             print("Usage: detail <server> <tool>")
@@ -212,7 +389,7 @@ def main():
         print(f"Unknown command: {cmd}")
         sys.exit(1)
 
-    print(json.dumps(result, indent=2))
+    print(_dump_json(result))
 
 
 if __name__ == "__main__":
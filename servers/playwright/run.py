@@ -17,30 +17,52 @@ Usage:
     uv run servers/playwright/run.py click "button[data-testid='submit']"
     uv run servers/playwright/run.py screenshot output.png
     uv run servers/playwright/run.py eval "document.title"
+    uv run servers/playwright/run.py repl < commands.txt      # One command per line
     uv run servers/playwright/run.py stop                     # Stop browser
 """
 
 import asyncio
 import json
 import os
+import shlex
 import signal
 import subprocess
 import sys
 import time
 from pathlib import Path
 
-from playwright.async_api import async_playwright
-
 # State files
 STATE_FILE = Path("/tmp/playwright_state.json")
 CDP_PORT = 9222
 
+# In `repl` mode the first connection (Playwright driver, browser, page) is
+# kept and reused by every later command instead of being set up per command
+KEEP_SESSION = False
+session = None
+
+# STATE_FILE contents, read on first use and kept in step with every save
+state_cache = None
+
+
+def dump_json(obj, indent: bool = True) -> str:
+    """Serialize a result as JSON (orjson when installed, otherwise json)."""
+    try:
+        import orjson  # optional, C-implemented
+    except ImportError:
+        return json.dumps(obj, indent=2 if indent else None, default=str)
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, default=str, option=option).decode()
+
 
 def load_state() -> dict:
-    """Load browser state from file."""
-    if STATE_FILE.exists():
-        return json.loads(STATE_FILE.read_text())
-    return {}
+    """Load browser state from file (read once per process)."""
+    global state_cache
+    if state_cache is None:
+        try:
+            state_cache = json.loads(STATE_FILE.read_text())
+        except FileNotFoundError:
+            state_cache = {}
+    return state_cache
 
 
 def save_state(state: dict):
@@ -53,10 +75,19 @@ def save_state(state: dict):
 def is_browser_running() -> bool:
     """Check if browser is running on CDP port."""
     import socket
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    result = sock.connect_ex(('127.0.0.1', CDP_PORT))
-    sock.close()
-    return result == 0
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        # Bounded, so a wedged port can't stall every command
+        sock.settimeout(0.5)
+        return sock.connect_ex(('127.0.0.1', CDP_PORT)) == 0
+
+
+def chromium_revision(path: Path) -> int:
+    """Revision of a Playwright Chromium install (.../chromium-1194/... -> 1194)."""
+    for part in reversed(path.parts):
+        if part.startswith("chromium-"):
+            revision = part.removeprefix("chromium-")
+            return int(revision) if revision.isdigit() else -1
+    return -1
 
 
 def start_browser():
@@ -75,12 +106,16 @@ def start_browser():
         Path.home() / "Library" / "Caches" / "ms-playwright",  # macOS
         Path.home() / ".cache" / "ms-playwright",              # Linux
     ]
-    candidates = []
-    for cache in caches:
-        for pattern in patterns:
-            candidates.extend(sorted(cache.glob(pattern), reverse=True))
-
-    chromium_path = candidates[0] if candidates else None
+    # The first cache/pattern with a match wins; the rest are never globbed
+    chromium_path = next(
+        (
+            newest
+            for cache in caches
+            for pattern in patterns
+            if (newest := max(cache.glob(pattern), key=chromium_revision, default=None))
+        ),
+        None,
+    )
 
     if not chromium_path:
         # Use system Chrome as fallback
@@ -110,12 +145,16 @@ def start_browser():
         start_new_session=True
     )
 
-    # Wait for browser to be ready
-    for _ in range(30):
+    # Wait for browser to be ready: poll quickly at first, backing off to 0.2s,
+    # for at most 6s
+    delay = 0.01
+    deadline = time.monotonic() + 6.0
+    while time.monotonic() < deadline:
         if is_browser_running():
             save_state({"pid": proc.pid})
             return {"success": True, "message": "Browser started", "port": CDP_PORT, "pid": proc.pid}
-        time.sleep(0.2)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.2)
 
     return {"error": "Browser failed to start"}
 
@@ -136,21 +175,31 @@ def stop_browser():
     subprocess.run(["pkill", "-f", f"--remote-debugging-port={CDP_PORT}"], capture_output=True)
 
     # Clear state
-    if STATE_FILE.exists():
-        STATE_FILE.unlink()
+    global state_cache
+    state_cache = {}
+    STATE_FILE.unlink(missing_ok=True)
 
     return {"success": True, "message": "Browser stopped"}
 
 
 async def get_page():
     """Connect to persistent browser and get page."""
-    if not is_browser_running():
-        # Auto-start browser if not running
-        result = start_browser()
-        if "error" in result:
-            raise RuntimeError(result["error"])
+    global session
+    if session is not None:
+        return session
+
+    # Auto-start browser if not running; start_browser() probes the CDP port
+    # itself, so an already-running browser costs a single probe
+    result = start_browser()
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    if "pid" in result:
+        # Freshly started
         await asyncio.sleep(0.5)
 
+    # Imported here so start/stop/help don't pay for loading Playwright
+    from playwright.async_api import async_playwright
+
     p = await async_playwright().start()
     browser = await p.chromium.connect_over_cdp(f"http://127.0.0.1:{CDP_PORT}")
 
@@ -167,9 +216,26 @@ async def get_page():
         context = await browser.new_context()
         page = await context.new_page()
 
+    if KEEP_SESSION:
+        session = (p, browser, page)
     return p, browser, page
 
 
+async def release(p):
+    """Stop the Playwright driver after a command, unless the repl session owns it."""
+    if not KEEP_SESSION:
+        await p.stop()
+
+
+async def close_session():
+    """Stop the repl session's Playwright driver, if one was started."""
+    global session
+    if session is not None:
+        p, _, _ = session
+        session = None
+        await p.stop()
+
+
 async def cmd_start():
     """Start persistent browser."""
     return start_browser()
@@ -186,7 +252,7 @@ async def cmd_navigate(url: str):
     await page.goto(url, wait_until="domcontentloaded")
     title = await page.title()
     save_state({"url": url})
-    await p.stop()
+    await release(p)
     return {"success": True, "url": url, "title": title}
 
 
@@ -194,7 +260,7 @@ async def cmd_snapshot():
     """Get accessibility snapshot of the page."""
     p, browser, page = await get_page()
     snapshot = await page.accessibility.snapshot()
-    await p.stop()
+    await release(p)
     return {"snapshot": snapshot}
 
 
@@ -203,7 +269,7 @@ async def cmd_screenshot(filename: str = "/tmp/screenshot.png", full_page: bool
     p, browser, page = await get_page()
     path = Path(filename).absolute()
     await page.screenshot(path=path, full_page=full_page)
-    await p.stop()
+    await release(p)
     return {"success": True, "path": str(path)}
 
 
@@ -213,7 +279,7 @@ async def cmd_click(selector: str):
     await page.click(selector)
     new_url = page.url
     save_state({"url": new_url})
-    await p.stop()
+    await release(p)
     return {"success": True, "clicked": selector}
 
 
@@ -221,7 +287,7 @@ async def cmd_type(selector: str, text: str):
     """Type text into an element."""
     p, browser, page = await get_page()
     await page.fill(selector, text)
-    await p.stop()
+    await release(p)
     return {"success": True, "selector": selector, "text": text}
 
 
@@ -229,7 +295,7 @@ async def cmd_eval(expression: str):
     """Evaluate JavaScript expression."""
     p, browser, page = await get_page()
     result = await page.evaluate(expression)
-    await p.stop()
+    await release(p)
     return {"result": result}
 
 
@@ -237,7 +303,7 @@ async def cmd_content():
     """Get page text content."""
     p, browser, page = await get_page()
     text = await page.inner_text("body")
-    await p.stop()
+    await release(p)
     return {"text": text[:5000]}
 
 
@@ -248,7 +314,7 @@ async def cmd_wait(selector: str = None, timeout: int = 5000):
         await page.wait_for_selector(selector, timeout=timeout)
     else:
         await page.wait_for_timeout(timeout)
-    await p.stop()
+    await release(p)
     return {"success": True}
 
 
@@ -256,7 +322,7 @@ async def cmd_reload():
     """Reload the current page."""
     p, browser, page = await get_page()
     await page.reload(wait_until="domcontentloaded")
-    await p.stop()
+    await release(p)
     return {"success": True, "url": page.url}
 
 
@@ -271,7 +337,7 @@ async def cmd_press(selector_or_key: str, key: str = None):
         # press key - use global keyboard
         await page.keyboard.press(selector_or_key)
         result = {"success": True, "key": selector_or_key}
-    await p.stop()
+    await release(p)
     return result
 
 
@@ -297,6 +363,56 @@ COMMANDS = {
 }
 
 
+async def run_command(cmd: str, args: list[str]):
+    """Run one command by name (the caller checks that it exists)."""
+    func = COMMANDS[cmd]
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args)
+    return func(*args)
+
+
+async def cmd_repl():
+    """Run commands from stdin, one per line, over a single browser connection.
+
+    Each line is split like a shell command line and its result is printed as
+    one line of JSON, so a sequence of commands pays for the Playwright driver
+    startup and CDP connection once.
+    """
+    global KEEP_SESSION
+    KEEP_SESSION = True
+    count = 0
+    try:
+        for line in sys.stdin:
+            try:
+                argv = shlex.split(line, comments=True)
+            except ValueError as e:
+                # e.g. an unbalanced quote: report it and keep reading
+                print(dump_json({"error": str(e), "type": "ValueError"}, indent=False), flush=True)
+                count += 1
+                continue
+            if not argv:
+                continue
+            cmd, args = argv[0].lower(), argv[1:]
+            if cmd not in COMMANDS or cmd == "repl":
+                result = {"error": f"Unknown command: {cmd}"}
+            else:
+                try:
+                    result = await run_command(cmd, args)
+                except Exception as e:
+                    result = {"error": str(e), "type": type(e).__name__}
+                if cmd in ("start", "stop"):
+                    # The browser behind the session may have changed
+                    await close_session()
+            print(dump_json(result, indent=False), flush=True)
+            count += 1
+    finally:
+        await close_session()
+    return {"success": True, "commands": count}
+
+
+COMMANDS["repl"] = cmd_repl
+
+
 async def main():
     if len(sys.argv) < 2:
         print("Playwright Persistent Browser Runner")
@@ -312,6 +428,7 @@ async def main():
         print("  content               - Get page text")
         print("  wait [selector]       - Wait for element/timeout")
         print("  reload                - Reload current page")
+        print("  repl                  - Run commands from stdin over one connection")
         print("\nExamples:")
         print('  uv run servers/playwright/run.py start')
         print('  uv run servers/playwright/run.py navigate "http://localhost:8500"')
@@ -328,14 +445,10 @@ async def main():
         sys.exit(1)
 
     try:
-        func = COMMANDS[cmd]
-        if asyncio.iscoroutinefunction(func):
-            result = await func(*args)
-        else:
-            result = func(*args)
-        print(json.dumps(result, indent=2, default=str))
+        result = await run_command(cmd, args)
+        print(dump_json(result))
     except Exception as e:
-        print(json.dumps({"error": str(e), "type": type(e).__name__}, indent=2))
+        print(dump_json({"error": str(e), "type": type(e).__name__}))
         sys.exit(1)
 
 